@@ -8,12 +8,63 @@ class Settings:
     APP_NAME = "Unified Wellness FASTAPI Backend"
     PROJECT_VERSION = "0.5.0"
     DATABASE_URL = os.getenv("DATABASE_URL")
+    DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", 4))
 
     SECRET_KEY = os.getenv("SECRET_KEY")
     SESSION_SECRET = os.getenv("SESSION_SECRET")
     ALGORITHM =  os.getenv("ALGORITHM")
-    ACCESS_TOKEN_EXPIRE_DAYS = 7
+    # Short-lived access tokens carry the claims read endpoints need;
+    # refresh tokens are rotated on every use
+    ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 15))
+    REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 7))
+
+    # Password hashing: pbkdf2 rounds and the worker processes doing the work
+    PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", 29000))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+
+    # Authenticated user snapshot cache
+    USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", 10000))
+    USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", 60))
+
+    # Verified JWT claims cache
+    TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", 10000))
+    TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", 300))
+
+    # In-memory product catalog snapshot
+    CATALOG_CACHE_TTL_SECONDS = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", 30))
+
+    # Heart rate write-behind buffer
+    HEART_RATE_BUFFER_MAX_SIZE = int(os.getenv("HEART_RATE_BUFFER_MAX_SIZE", 10000))
+    HEART_RATE_FLUSH_BATCH_SIZE = int(os.getenv("HEART_RATE_FLUSH_BATCH_SIZE", 500))
+    HEART_RATE_FLUSH_INTERVAL_SECONDS = float(os.getenv("HEART_RATE_FLUSH_INTERVAL_SECONDS", 1.0))
+    HEART_RATE_SUBSCRIBER_QUEUE_SIZE = int(os.getenv("HEART_RATE_SUBSCRIBER_QUEUE_SIZE", 32))
+
+    # Heart rate batch uploads: most samples accepted per request
+    HEART_RATE_MAX_BATCH_SAMPLES = int(os.getenv("HEART_RATE_MAX_BATCH_SAMPLES", 100_000))
+
+    # Heart rate broadcast across worker processes: "memory" or "unix"
+    BROADCAST_BACKEND = os.getenv("BROADCAST_BACKEND", "memory")
+    BROADCAST_SOCKET_PATH = os.getenv("BROADCAST_SOCKET_PATH", "/tmp/unified-wellness-broadcast.sock")
     
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+    # "google" for the real API, "fake" for the local stand-in
+    GEMINI_CLIENT = os.getenv("GEMINI_CLIENT", "google")
+    FAKE_GEMINI_LATENCY_SECONDS = float(os.getenv("FAKE_GEMINI_LATENCY_SECONDS", 0))
+
+    # Outbound AI calls: concurrency cap, deadline and circuit breaker
+    AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", 8))
+    AI_TIMEOUT_SECONDS = float(os.getenv("AI_TIMEOUT_SECONDS", 60))
+    AI_BREAKER_FAILURE_THRESHOLD = int(os.getenv("AI_BREAKER_FAILURE_THRESHOLD", 5))
+    AI_BREAKER_RESET_SECONDS = float(os.getenv("AI_BREAKER_RESET_SECONDS", 30))
+
+    # Food image uploads: size cap, downscale target and preprocessing workers
+    IMAGE_MAX_UPLOAD_BYTES = int(os.getenv("IMAGE_MAX_UPLOAD_BYTES", 15 * 1024 * 1024))
+    IMAGE_MAX_DIMENSION = int(os.getenv("IMAGE_MAX_DIMENSION", 1024))
+    IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", 2))
+
+    # Content-addressed cache of food image analyses
+    AI_CACHE_PATH = os.getenv("AI_CACHE_PATH", "/tmp/unified-wellness-ai-cache.db")
+    AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", 10000))
+    AI_CACHE_TTL_SECONDS = float(os.getenv("AI_CACHE_TTL_SECONDS", 30 * 86400))
 
 settings = Settings()
\ No newline at end of file
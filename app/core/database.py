@@ -1,4 +1,8 @@
-from sqlalchemy import create_engine
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from core.config import settings
@@ -12,6 +16,14 @@ Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# Bounded pool for blocking database work issued from async handlers
+db_executor = ThreadPoolExecutor(
+    max_workers=settings.DB_EXECUTOR_WORKERS,
+    thread_name_prefix="db"
+)
+
+T = TypeVar("T")
+
 
 def get_db():
     """Dependency for getting database session"""
@@ -20,9 +32,82 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def run_db(func: Callable[..., T]) -> T:
+    """Run func(session) on the database thread pool without blocking the event loop"""
+    def call():
+        db = Session()
+        try:
+            return func(db)
+        finally:
+            db.close()
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, call)
         
 
+def dialect_insert(model):
+    """INSERT construct for the active dialect, supporting ON CONFLICT clauses"""
+    if engine.dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
 def init_db():
     """Initialize database tables"""
     from models import user, health, product,blog
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    from services.heart_rate_rollup import backfill_rollups
+
+    existing_tables = set(inspect(engine).get_table_names())
+    Base.metadata.create_all(bind=engine)
+    migrate_columns()
+    migrate_indexes()
+
+    # Readings stored before rollups existed need their buckets built once
+    if "heartrate" in existing_tables and "heartrate_rollup" not in existing_tables:
+        db = Session()
+        try:
+            backfill_rollups(db)
+        finally:
+            db.close()
+
+
+def migrate_columns():
+    """Add declared columns missing from tables that already exist"""
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = f"ALTER TABLE \"{table.name}\" ADD COLUMN {column.name} {column.type.compile(engine.dialect)}"
+            if column.server_default is not None:
+                ddl += f" DEFAULT {column.server_default.arg}"
+            if not column.nullable:
+                ddl += " NOT NULL"
+            with engine.begin() as conn:
+                conn.execute(text(ddl))
+
+
+def migrate_indexes():
+    """Create any declared indexes missing from tables that already exist"""
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {i["name"] for i in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            if index.unique:
+                _drop_duplicates(table.name, [c.name for c in index.columns])
+            index.create(bind=engine)
+
+
+def _drop_duplicates(table_name: str, columns: list):
+    """Keep only the oldest row per key so a new unique index can be built"""
+    key = ", ".join(columns)
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"DELETE FROM {table_name} WHERE id NOT IN "
+            f"(SELECT MIN(id) FROM {table_name} GROUP BY {key})"
+        ))
\ No newline at end of file
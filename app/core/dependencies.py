@@ -1,47 +1,121 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from core.cache import TTLCache
+from core.config import settings
 from core.database import get_db
 from core.security import decode_token
 from models.user import User
+from schemas.user import CurrentUser, TokenClaims
 
 security = HTTPBearer()
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user"""
+# Snapshots of authenticated users keyed by id, reused while their profile
+# version matches the user row
+user_cache = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS
+)
+
+
+def _token_payload(credentials: HTTPAuthorizationCredentials) -> dict:
     payload = decode_token(credentials.credentials)
-    
+
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials"
         )
-    
-    user_id = payload.get("sub")
-    if not user_id:
+
+    if not payload.get("sub"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload"
         )
-    
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if not user:
+
+    return payload
+
+
+def _profile_version(user_id: int, db: Session):
+    """Current profile version of a user, or None if the user is gone"""
+    return db.query(User.profile_version)\
+        .filter(User.id == user_id)\
+        .scalar()
+
+
+def _load_user(user_id: int, db: Session, version=None) -> CurrentUser:
+    """
+    Get a user's snapshot, reloading it if the profile changed in any worker.
+
+    Args:
+        version: The user's current profile version, if already looked up
+    """
+    if version is None:
+        version = _profile_version(user_id, db)
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    
+
+    user = user_cache.get(user_id)
+    if user is not None and user.profile_version == version:
+        return user
+
+    db_user = db.query(User).filter(User.id == user_id).first()
+    if not db_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+    user = CurrentUser.model_validate(db_user)
+    user_cache.set(user.id, user)
     return user
 
 
-def require_admin(current_user: User = Depends(get_current_user)) -> User:
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> CurrentUser:
+    """Get current authenticated user"""
+    payload = _token_payload(credentials)
+    return _load_user(int(payload["sub"]), db)
+
+
+def get_token_claims(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> TokenClaims:
+    """
+    Get the authenticated user's role and profile straight from the token.
+
+    The token's profile version is checked against the user row, which
+    every worker shares, so a profile change made through any worker
+    takes effect at once. Tokens issued before the change, and tokens
+    without profile claims, fall back to loading the user.
+    """
+    payload = _token_payload(credentials)
+    user_id = int(payload["sub"])
+
+    version = _profile_version(user_id, db)
+    if "pv" in payload and payload["pv"] == version:
+        return TokenClaims(
+            id=user_id,
+            role=payload.get("role"),
+            height_cm=payload.get("height_cm"),
+            weight_kg=payload.get("weight_kg"),
+            goals=payload.get("goals")
+        )
+
+    return TokenClaims.model_validate(_load_user(user_id, db, version))
+
+
+def require_admin(claims: TokenClaims = Depends(get_token_claims)) -> TokenClaims:
     """Require admin role"""
-    if current_user.role != "ADMIN":
+    if claims.role != "ADMIN":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
         )
-    return current_user
\ No newline at end of file
+    return claims
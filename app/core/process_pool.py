@@ -0,0 +1,81 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# One set of worker processes is shared by every ProcessPool. Forking is
+# only safe while the process has a single thread, and each executor starts
+# a manager thread on first use, so a second executor would fork from an
+# already multi-threaded process.
+_executor: Optional[ProcessPoolExecutor] = None
+_total_workers = 0
+_running_pools = 0
+_executor_lock = threading.Lock()
+
+
+class ProcessPool:
+    """
+    Worker processes for CPU-bound work issued from async handlers.
+
+    CPU-heavy calls hold the GIL, so running them on a thread pool still
+    stalls every other request; separate processes don't. Each pool
+    contributes its workers to the shared executor and caps how many of its
+    calls run at once; the rest wait in line. Create pools at import time,
+    before the first one is started.
+    """
+
+    def __init__(self, max_workers: int):
+        """
+        Initialize the pool.
+
+        Args:
+            max_workers: Number of worker processes
+        """
+        global _total_workers
+        self.max_workers = max_workers
+        self._slots = asyncio.Semaphore(max_workers)
+        self._running = False
+        with _executor_lock:
+            _total_workers += max_workers
+
+    def start(self):
+        """Start the worker processes."""
+        global _executor, _running_pools
+        with _executor_lock:
+            if self._running:
+                return
+            self._running = True
+            _running_pools += 1
+
+            if _executor is None:
+                # Fork every pool's workers at once, before the app starts its
+                # own threads; with fork all workers are created on the first
+                # submit, so warm the executor right away
+                _executor = ProcessPoolExecutor(
+                    max_workers=_total_workers,
+                    mp_context=multiprocessing.get_context("fork")
+                )
+                _executor.submit(int).result()
+
+    def stop(self):
+        """Wait for in-flight calls; the last pool to stop stops the worker processes."""
+        global _executor, _running_pools
+        with _executor_lock:
+            if not self._running:
+                return
+            self._running = False
+            _running_pools -= 1
+
+            if _running_pools == 0 and _executor is not None:
+                _executor.shutdown(wait=True)
+                _executor = None
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """Run func(*args) in a worker process without blocking the event loop."""
+        self.start()
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_executor, func, *args)
@@ -1,10 +1,33 @@
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+import hashlib
+import secrets
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from core.cache import ExpiringSet, TTLCache
+from core.process_pool import ProcessPool
 from core.config import settings
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# Hashes made with any other round count are flagged for rehashing on login
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    deprecated="auto",
+    pbkdf2_sha256__default_rounds=settings.PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__min_rounds=settings.PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__max_rounds=settings.PASSWORD_HASH_ROUNDS
+)
+
+# Login and signup hashing runs in its own worker processes
+password_pool = ProcessPool(max_workers=settings.PASSWORD_HASH_WORKERS)
+
+# Verified claims keyed by token hash
+token_cache = TTLCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS
+)
+# Hashes of revoked tokens, each kept until the token itself expires
+revoked_tokens = ExpiringSet()
 
 
 def hash_password(password: str) -> str:
@@ -17,23 +40,119 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password, returning a new hash if the stored one uses outdated parameters"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password in the worker pool without blocking the event loop"""
+    return await password_pool.run(hash_password, password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify (and maybe rehash) a password in the worker pool"""
+    return await password_pool.run(verify_and_update_password, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
     
     if expires_delta:
-        expire = datetime.now() + expires_delta
+        expire = datetime.now(timezone.utc) + expires_delta
     else:
-        expire = datetime.now() + timedelta(days=settings.ACCESS_TOKEN_EXPIRE_DAYS)
+        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "type": "access", "jti": secrets.token_urlsafe(8)})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def decode_token(token: str) -> dict:
-    """Decode and verify JWT token"""
+
+def create_refresh_token(user_id: int) -> Tuple[str, dict]:
+    """Create a single-use JWT refresh token, returning it with its claims"""
+    expire = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    claims = {
+        "sub": str(user_id),
+        "type": "refresh",
+        "jti": secrets.token_urlsafe(16),
+        "exp": int(expire.timestamp())
+    }
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM), claims
+
+
+def create_token_pair(user) -> Tuple[dict, dict]:
+    """
+    Create an access/refresh token pair for a user.
+
+    The access token carries the role and the profile fields read
+    endpoints need, so they can be answered from the claims alone. The
+    refresh token's claims are returned alongside the pair so the caller
+    can record it as issued.
+    """
+    access_token = create_access_token({
+        "sub": str(user.id),
+        "role": user.role,
+        "height_cm": user.height_cm,
+        "weight_kg": user.weight_kg,
+        "goals": user.goals,
+        "pv": user.profile_version
+    })
+    refresh_token, refresh_claims = create_refresh_token(user.id)
+    pair = {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    }
+    return pair, refresh_claims
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _verify_token(token: str) -> Optional[dict]:
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+
+def decode_token(token: str, token_type: str = "access") -> dict:
+    """Decode and verify JWT token, reusing claims verified earlier"""
+    key = _token_key(token)
+    if key in revoked_tokens:
+        return None
+
+    payload = token_cache.get(key)
+    if payload is None:
+        payload = _verify_token(token)
+        if payload is None:
+            return None
+
+        # Never serve cached claims past the token's own expiry
+        remaining = payload.get("exp", 0) - time.time()
+        if remaining > 0:
+            token_cache.set(key, payload, min(remaining, token_cache.ttl_seconds))
+
+    # Tokens issued before the refresh flow have no type and act as access tokens
+    if payload.get("type", "access") != token_type:
+        return None
+
+    return dict(payload)
+
+
+def revoke_token(token: str):
+    """Reject a token from now on, even while it is cached"""
+    key = _token_key(token)
+    token_cache.invalidate(key)
+
+    # A token that no longer verifies is rejected anyway
+    payload = _verify_token(token)
+    if payload is not None:
+        revoked_tokens.add(key, payload.get("exp", float("inf")))
+
+
+def clear_token_cache():
+    """Force every token to be verified again on next use"""
+    token_cache.clear()
\ No newline at end of file
@@ -0,0 +1,56 @@
+from typing import Dict
+
+from fastapi import HTTPException
+
+# Room for multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadLimitMiddleware:
+    """
+    Cap the request body size on upload routes before it is received.
+
+    Form and body parsing read the whole body into memory or onto disk
+    before the handler runs, so a size check in the handler saves neither.
+    This rejects the request with 413 as soon as its Content-Length, or the
+    bytes actually received for a chunked body, pass the route's cap.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: ASGI application to wrap
+            limits: Largest request body in bytes, by request path
+        """
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        max_body_bytes = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if max_body_bytes is None:
+            await self.app(scope, receive, send)
+            return
+
+        too_large = HTTPException(status_code=413, detail=f"Request body larger than {max_body_bytes} bytes")
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        declared = int(content_length) if content_length and content_length.isdigit() else None
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            # Raised from inside body parsing, so the app turns it into a 413
+            # response before reading anything
+            if declared is not None and declared > max_body_bytes:
+                raise too_large
+
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body_bytes:
+                    raise too_large
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -1,23 +1,25 @@
 from fastapi import FastAPI,WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
 
-from typing import List
-from datetime import datetime
-import asyncio
+from contextlib import asynccontextmanager
 
 from core.config import settings
-from core.database import init_db
+from core.database import init_db, db_executor
+from core.security import password_pool
+from core.upload_limit import MULTIPART_OVERHEAD_BYTES, UploadLimitMiddleware
+from services.ai_service import image_pool
+from services.heart_rate_ingest import MAX_BATCH_SAMPLES, MAX_JSON_SAMPLE_BYTES
+from services.workout_plan_service import workout_plans
 
 # Import routers
 from router import page_router,auth_router,user_router,ai_router,products_router,blogs_router,health_router,nutrition_router,sleep_router,workout_router,bmi_router
 from utils.create_admin import create_admin_user
+from utils.hr_codec import max_payload_size
+from services.search_service import init_search
+from services.recommendation_service import backfill_product_tags
 
-from services.heart_rate_service import HeartRateSimulator
-from models.health import HeartRate
-from core.database import Session
-
-# Active WebSocket connections
-active_connections: List[WebSocket] = []
+from services.heart_rate_buffer import heart_rate_buffer
+from services.heart_rate_hub import heart_rate_hub
 
 def include_router(app):
     # Include routers
@@ -33,11 +35,37 @@ def include_router(app):
     app.include_router(nutrition_router.router)
     app.include_router(bmi_router.router)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    password_pool.start()
+    image_pool.start()
+    await heart_rate_buffer.start()
+    await heart_rate_hub.start()
+    yield
+    await heart_rate_hub.stop()
+    await workout_plans.stop()
+    # Flush any buffered heart rate samples before exiting
+    await heart_rate_buffer.stop()
+    db_executor.shutdown(wait=True)
+    password_pool.stop()
+    image_pool.stop()
+
 def start_application():    
-    app = FastAPI(title=settings.APP_NAME,version=settings.PROJECT_VERSION)
+    app = FastAPI(title=settings.APP_NAME,version=settings.PROJECT_VERSION,lifespan=lifespan)
     # Mount static files
     app.mount("/static", StaticFiles(directory="static"), name="static")
+    # Reject oversized photos and batches before their body is read
+    app.add_middleware(
+        UploadLimitMiddleware,
+        limits={
+            "/api/ai/nutrition-image": settings.IMAGE_MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+            "/api/heart-rate/batch": MAX_BATCH_SAMPLES * MAX_JSON_SAMPLE_BYTES,
+            "/api/heart-rate/batch/binary": max_payload_size(MAX_BATCH_SAMPLES)
+        }
+    )
     init_db()
+    init_search()
+    backfill_product_tags()
     create_admin_user()
     include_router(app)
     return app
@@ -47,44 +75,18 @@ app = start_application()
 @app.websocket("/ws/heart-rate/{user_id}")
 async def websocket_heart_rate(websocket: WebSocket, user_id: int):
     await websocket.accept()
-    active_connections.append(websocket)
     
-    simulator = HeartRateSimulator(activity_level="resting")
-    db = Session()
+    # Every viewer of the same user shares one producer and one stored stream
+    subscriber = heart_rate_hub.subscribe(user_id)
     try:
-        activities = ["resting", "walking", "jogging", "running", "cooldown", "resting"]
-        activity_index = 0
-        messages_sent = 0
-        
         while True:
-            if messages_sent > 0 and messages_sent % 30 == 0:
-                activity_index = min(activity_index + 1, len(activities) - 1)
-                simulator.transition_activity(activities[activity_index])
-            
-            bpm = simulator.get_next_value()
-            timestamp = datetime.now().isoformat()
-            timestampdb = datetime.now()
-            
-            hr = HeartRate(
-                user_id=user_id,
-                bpm=bpm,
-                timestamp=timestampdb
-            )
-            db.add(hr)
-            db.commit()
-            
-            await websocket.send_json({
-                "bpm": bpm,
-                "timestamp": timestamp,
-                "activity": simulator.activity_level,
-                "user_id": user_id
-            })
-            
-            messages_sent += 1
-            await asyncio.sleep(1)
+            frame = await subscriber.queue.get()
+            await websocket.send_text(frame)
             
     except WebSocketDisconnect:
-        active_connections.remove(websocket)
+        pass
+    finally:
+        heart_rate_hub.unsubscribe(user_id, subscriber)
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, Text
 from datetime import datetime
 from core.database import Base
 
 
 class Blog(Base):
     __tablename__ = "blog"
+    __table_args__ = (
+        Index("ix_blog_created_at", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
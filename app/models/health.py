@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey, Index, Text, UniqueConstraint
 from datetime import datetime
 from core.database import Base
 
 
 class HeartRate(Base):
     __tablename__ = "heartrate"
+    __table_args__ = (
+        # One sample per user and timestamp, so retried uploads are idempotent
+        Index("uq_heartrate_user_timestamp", "user_id", "timestamp", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
@@ -12,8 +16,28 @@ class HeartRate(Base):
     bpm = Column(Integer, nullable=False)
 
 
+class HeartRateRollup(Base):
+    """Precomputed min/max/mean/count of heart rate per time bucket."""
+    __tablename__ = "heartrate_rollup"
+    __table_args__ = (
+        UniqueConstraint("user_id", "resolution", "bucket_start", name="uq_heartrate_rollup_bucket"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    resolution = Column(String, nullable=False)  # "1m", "1h" or "1d"
+    bucket_start = Column(DateTime, nullable=False)
+    min_bpm = Column(Integer, nullable=False)
+    max_bpm = Column(Integer, nullable=False)
+    sum_bpm = Column(Integer, nullable=False)
+    count = Column(Integer, nullable=False)
+
+
 class Workout(Base):
     __tablename__ = "workout"
+    __table_args__ = (
+        Index("ix_workout_user_date", "user_id", "date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
@@ -25,6 +49,9 @@ class Workout(Base):
 
 class Sleep(Base):
     __tablename__ = "sleep"
+    __table_args__ = (
+        Index("ix_sleep_user_date", "user_id", "date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
@@ -35,6 +62,9 @@ class Sleep(Base):
 
 class Nutrition(Base):
     __tablename__ = "nutrition"
+    __table_args__ = (
+        Index("ix_nutrition_user_date", "user_id", "date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
@@ -48,10 +78,29 @@ class Nutrition(Base):
 
 class Anomaly(Base):
     __tablename__ = "anomaly"
+    __table_args__ = (
+        Index("ix_anomaly_user_timestamp", "user_id", "timestamp"),
+        # Natural key: one stored anomaly per user, type and sample second
+        Index("uq_anomaly_user_type_timestamp", "user_id", "type", "timestamp", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
     type = Column(String, nullable=False)
     message = Column(String, nullable=False)
     severity = Column(String, default="medium")
-    timestamp = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    timestamp = Column(DateTime, default=datetime.utcnow)
+
+
+class StoredWorkoutPlan(Base):
+    """Latest generated workout plan per user, with the fingerprint of its inputs"""
+    __tablename__ = "workout_plan"
+    __table_args__ = (
+        Index("uq_workout_plan_user", "user_id", unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    fingerprint = Column(String, nullable=False)
+    plan = Column(Text, nullable=False)
+    generated_at = Column(DateTime, default=datetime.now)
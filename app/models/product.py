@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from datetime import datetime
 from core.database import Base
 
 
 class Product(Base):
     __tablename__ = "product"
+    __table_args__ = (
+        Index("ix_product_created_at", "created_at"),
+        Index("ix_product_category_created_at", "category", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -13,3 +17,14 @@ class Product(Base):
     category = Column(String, nullable=False)
     image_url = Column(String, nullable=False)  
     created_at = Column(DateTime, default=datetime.now())
+
+
+class ProductTag(Base):
+    """Features extracted from a product when it is written, used for recommendations"""
+    __tablename__ = "product_tag"
+    __table_args__ = (
+        Index("ix_product_tag_tag", "tag"),
+    )
+
+    product_id = Column(Integer, ForeignKey("product.id"), primary_key=True)
+    tag = Column(String, primary_key=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, ForeignKey, Integer, String, Float
 from core.database import Base
 
 class User(Base):
@@ -14,4 +14,15 @@ class User(Base):
     gender = Column(String)
     goals = Column(String)
     diet_type = Column(String)
-    role = Column(String, default="USER")
\ No newline at end of file
+    role = Column(String, default="USER")
+    # Bumped on every profile change; access tokens carry the version they were issued at
+    profile_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class RefreshToken(Base):
+    """An issued refresh token that has not been used yet."""
+    __tablename__ = "refresh_token"
+    
+    jti = Column(String, primary_key=True)
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=False, index=True)
+    expires_at = Column(Integer, nullable=False)  # Unix time, as in the token's exp
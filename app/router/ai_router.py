@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, File, UploadFile
-from sqlalchemy.orm import Session
-from core.database import get_db
-from core.dependencies import get_current_user
+from fastapi import APIRouter, Depends, File, Response, UploadFile
+from core.dependencies import get_current_user, require_admin
 from models.user import User
-from services.ai_service import analyze_food_image, generate_workout_plan
+from services.ai_cache import analysis_cache
+from services.ai_gateway import ai_gateway
+from services.ai_service import analyze_food_image
+from services.workout_plan_service import workout_plans
+from utils.streaming import sse_response
 
 router = APIRouter(prefix="/api/ai", tags=["AI Services"])
 
@@ -19,9 +21,44 @@ async def analyze_food(
 
 @router.post("/workout-plan")
 async def create_workout_plan(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    current_user: User = Depends(get_current_user)
 ):
-    """Generate personalized AI workout plan"""
-    plan = await generate_workout_plan(current_user, db)
-    return plan
\ No newline at end of file
+    """
+    Get the user's personalized AI workout plan.
+
+    Plans are generated in the background. The X-Plan-Status header tells
+    whether the plan matches the user's current data ("ready") or a new
+    one is on its way ("stale"). With no plan yet the response is 202 and
+    the client should retry shortly.
+    """
+    status, plan = await workout_plans.get_plan(current_user)
+    response.headers["X-Plan-Status"] = status
+
+    if plan is None:
+        response.status_code = 202
+        return {"status": status}
+    return plan
+
+
+@router.post("/workout-plan/stream")
+async def stream_workout_plan(current_user: User = Depends(get_current_user)):
+    """
+    Stream the user's personalized AI workout plan as Server-Sent Events.
+
+    Each day is sent as soon as the model has written it, followed by the
+    complete plan. See WorkoutPlanService.stream_plan for the events.
+    """
+    return sse_response(workout_plans.stream_plan(current_user))
+
+
+@router.get("/cache/metrics")
+def get_ai_cache_metrics(admin: User = Depends(require_admin)):
+    """Get food image analysis cache hit rates (Admin only)"""
+    return analysis_cache.metrics()
+
+
+@router.get("/gateway/metrics")
+def get_ai_gateway_metrics(admin: User = Depends(require_admin)):
+    """Get outbound AI call counts, circuit state and latency (Admin only)"""
+    return ai_gateway.metrics()
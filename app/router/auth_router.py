@@ -1,25 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException
 from sqlalchemy.orm import Session
-from core.database import get_db
-from core.security import hash_password, verify_password, create_access_token
+from core.database import run_db
+from core.security import hash_password_async, verify_and_update_password_async, decode_token
 from models.user import User
-from schemas.user import UserSignup, UserLogin, TokenResponse, UserResponse
+from schemas.user import UserSignup, UserLogin, RefreshRequest, TokenResponse, UserResponse
+from services.token_service import consume_refresh_token, issue_token_pair
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
-@router.post("/signup", response_model=TokenResponse)
-def signup(user_data: UserSignup, db: Session = Depends(get_db)):
-    """Register a new user"""
-    # Check if user exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
+
+def _find_user(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+
+def _get_user(db: Session, user_id: int):
+    return db.query(User).filter(User.id == user_id).first()
+
+
+def _create_user(db: Session, user_data: UserSignup, password_hash: str) -> User:
+    # Check again in case the same email signed up while we were hashing
+    if _find_user(db, user_data.email):
         raise HTTPException(status_code=400, detail="Email already registered")
-    
-    # Create new user
+
     new_user = User(
         name=user_data.name,
         email=user_data.email,
-        password_hash=hash_password(user_data.password),
+        password_hash=password_hash,
         role="USER",
         age=user_data.age,
         height_cm=user_data.height_cm,
@@ -28,35 +34,85 @@ def signup(user_data: UserSignup, db: Session = Depends(get_db)):
         goals=user_data.goals,
         diet_type=user_data.diet_type
     )
-    
+
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
-    
-    # Generate token
-    token = create_access_token({"sub": str(new_user.id), "role": new_user.role})
-    
+    return new_user
+
+
+def _rotate_refresh_token(db: Session, jti: str) -> dict:
+    # Use up the old refresh token and issue the new pair in one transaction
+    user_id = consume_refresh_token(db, jti)
+    user = _get_user(db, user_id) if user_id is not None else None
+    if not user:
+        db.rollback()
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+    # Read the user before the commit expires it
+    user_response = UserResponse.model_validate(user)
+    return {
+        **issue_token_pair(db, user),
+        "user": user_response
+    }
+
+
+def _update_password_hash(db: Session, user_id: int, password_hash: str):
+    db.query(User).filter(User.id == user_id).update({User.password_hash: password_hash})
+    db.commit()
+
+
+@router.post("/signup", response_model=TokenResponse)
+async def signup(user_data: UserSignup):
+    """Register a new user"""
+    # Check if user exists before spending CPU on the hash
+    existing_user = await run_db(lambda db: _find_user(db, user_data.email))
+    if existing_user:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    # Hash in the worker pool, then create the user
+    password_hash = await hash_password_async(user_data.password)
+    new_user = await run_db(lambda db: _create_user(db, user_data, password_hash))
+
+    # Generate tokens
+    tokens = await run_db(lambda db: issue_token_pair(db, new_user))
     return {
-        "access_token": token,
-        "token_type": "bearer",
+        **tokens,
         "user": UserResponse.model_validate(new_user)
     }
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin):
     """Login user"""
     # Find user
-    user = db.query(User).filter(User.email == credentials.email).first()
-    
-    if not user or not verify_password(credentials.password, user.password_hash):
+    user = await run_db(lambda db: _find_user(db, credentials.email))
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    
-    # Generate token
-    token = create_access_token({"sub": str(user.id), "role": user.role})
-    
+
+    valid, new_hash = await verify_and_update_password_async(credentials.password, user.password_hash)
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    # Hashed with old parameters: store a fresh hash now that we know the password
+    if new_hash:
+        await run_db(lambda db: _update_password_hash(db, user.id, new_hash))
+
+    # Generate tokens
+    tokens = await run_db(lambda db: issue_token_pair(db, user))
     return {
-        "access_token": token,
-        "token_type": "bearer",
+        **tokens,
         "user": UserResponse.model_validate(user)
-    }
\ No newline at end of file
+    }
+
+
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh(body: RefreshRequest):
+    """Exchange a refresh token for a new token pair"""
+    payload = decode_token(body.refresh_token, token_type="refresh")
+    if not payload:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+    # Rotate: each refresh token can be used only once. The user is
+    # reloaded so new tokens pick up role and profile changes
+    return await run_db(lambda db: _rotate_refresh_token(db, payload.get("jti", "")))
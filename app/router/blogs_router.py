@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Optional
 from datetime import datetime
 
 from core.database import get_db
@@ -8,20 +8,29 @@ from core.dependencies import get_current_user
 from models.user import User
 from models.blog import Blog
 from schemas.blog import BlogCreate, BlogResponse
+from schemas.pagination import Page
+from services.search_service import search_page
+from utils.pagination import paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/api/blogs", tags=["Blogs"])
 
 
-@router.get("", response_model=List[BlogResponse])
-def get_blogs(db: Session = Depends(get_db)):
+@router.get("", response_model=Page[BlogResponse])
+def get_blogs(
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db)
+):
     """
-    Get all blog posts.
+    Get blog posts, newest first, one page at a time.
+
+    With a search string, posts are ranked by relevance instead.
     """
-    blogs = db.query(Blog)\
-        .order_by(Blog.created_at.desc())\
-        .all()
-    
-    return blogs
+    if search:
+        return search_page(db.query(Blog), Blog, search, cursor, limit)
+
+    return paginate(db.query(Blog), Blog.created_at, Blog.id, cursor, limit)
 
 
 @router.post("", response_model=BlogResponse)
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
-from core.dependencies import get_current_user
-from models.user import User
+from core.dependencies import get_token_claims
+from schemas.user import TokenClaims
 
 router = APIRouter(prefix="/api/bmi", tags=["User"])
 
 
 @router.get("/")
-def calculate_bmi(current_user: User = Depends(get_current_user)):
-    """Calculate user BMI"""
+def calculate_bmi(current_user: TokenClaims = Depends(get_token_claims)):
+    """Calculate user BMI from the access token's profile claims"""
     if not current_user.height_cm or not current_user.weight_kg:
         raise HTTPException(status_code=400, detail="Height and weight required")
     
@@ -1,31 +1,62 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime, timedelta
+from typing import List, Optional, Union
+from datetime import datetime
 import asyncio
+from array import array
 
-from core.database import get_db
-from core.dependencies import get_current_user
+from core.database import get_db, Session as SessionLocal
+from core.dependencies import get_current_user, require_admin
 from models.user import User
-from models.health import HeartRate, Anomaly
-from schemas.health import HeartRateCreate, HeartRateResponse
-from services.heart_rate_service import HeartRateSimulator
+from models.health import HeartRate
+from schemas.health import HeartRateCreate, HeartRateBatchCreate, HeartRateResponse, HeartRateRollupResponse
+from services.heart_rate_service import SIMULATION_PHASES, simulate_history
+from services.heart_rate_buffer import heart_rate_buffer
+from services.heart_rate_hub import heart_rate_hub
+from services.anomaly_monitor import anomaly_monitor
+from services.anomaly_service import anomaly_row, save_anomalies
+from services.heart_rate_ingest import MAX_BATCH_SAMPLES, ingest_samples, insert_samples, naive_local, score_samples
+from services.heart_rate_rollup import get_rollups, rollup_point, rollup_query
 from utils.anamoly_detection import detect_anomalies
+from utils.hr_codec import decode_samples, max_payload_size
+from utils.streaming import json_object_response, ndjson_response
 
 router = APIRouter(prefix="/api/heart-rate", tags=["Health"])
 
-@router.get("/history", response_model=List[HeartRateResponse])
+@router.get("/history", response_model=Union[List[HeartRateResponse], List[HeartRateRollupResponse]])
 def get_heart_rate_history(
+    resolution: str = Query("raw", pattern="^(raw|1m|1h|1d)$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=5000),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get heart rate history for current user.
+
+    With resolution=1m/1h/1d, points are read from the precomputed
+    min/max/mean rollups instead of the raw samples. With format=ndjson,
+    every point in [start, end] is streamed instead of a single page.
     """
-    records = db.query(HeartRate)\
-        .filter(HeartRate.user_id == current_user.id)\
+    if format == "ndjson":
+        return ndjson_response(_stream_history(current_user.id, resolution, start, end))
+
+    if resolution != "raw":
+        return get_rollups(db, current_user.id, resolution, start, end, limit)
+
+    query = db.query(HeartRate)\
+        .filter(HeartRate.user_id == current_user.id)
+
+    if start:
+        query = query.filter(HeartRate.timestamp >= start)
+    if end:
+        query = query.filter(HeartRate.timestamp <= end)
+
+    records = query\
         .order_by(HeartRate.timestamp.desc())\
-        .limit(100)\
+        .limit(limit)\
         .all()
     
     return records
@@ -39,54 +70,100 @@ def save_heart_rate(
 ):
     """
     Save a heart rate reading.
+
+    Readings carry the device timestamp when given; re-sending the same
+    reading returns the stored one instead of creating a duplicate.
     """
-    hr = HeartRate(
-        user_id=current_user.id,
-        bpm=data.bpm,
-        timestamp=datetime.now()
-    )
+    timestamp = naive_local(data.timestamp) if data.timestamp else datetime.now()
     
-    db.add(hr)
+    inserted = insert_samples(db, [{
+        "user_id": current_user.id,
+        "bpm": data.bpm,
+        "timestamp": timestamp
+    }])
+    score_samples(db, inserted)
     db.commit()
-    db.refresh(hr)
     
-    return hr
+    return db.query(HeartRate)\
+        .filter(HeartRate.user_id == current_user.id)\
+        .filter(HeartRate.timestamp == timestamp)\
+        .first()
 
 
-@router.get("/simulate/{duration_seconds}")
-def generate_heart_rate_history(duration_seconds: int = 3600):
+@router.post("/batch")
+def save_heart_rate_batch(
+    data: HeartRateBatchCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """
-    Generate simulated heart rate history for testing.
+    Save a batch of (timestamp, bpm) readings, e.g. a wearable sync.
     """
-    simulator = HeartRateSimulator()
-    history = []
-    
-    phases = [
-        ("resting", 600),
-        ("walking", 900),
-        ("jogging", 1200),
-        ("cooldown", 600),
-        ("resting", 300)
-    ]
+    timestamps = [ts for ts, _ in data.samples]
+    try:
+        bpm_values = array("h", [bpm for _, bpm in data.samples])
+    except OverflowError:
+        raise HTTPException(status_code=422, detail="bpm value out of range")
     
-    current_time = datetime.now()
-    
-    for activity, duration in phases:
-        simulator.transition_activity(activity)
-        for _ in range(duration):
-            bpm = simulator.get_next_value()
-            history.append({
-                "timestamp": current_time.isoformat(),
-                "bpm": bpm,
-                "activity": activity
-            })
-            current_time = current_time + timedelta(seconds=1)
+    return ingest_samples(db, current_user.id, timestamps, bpm_values)
+
+
+@router.post("/batch/binary")
+def save_heart_rate_batch_binary(
+    payload: bytes = Body(..., media_type="application/octet-stream"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Save a batch of readings in the compact delta-encoded binary format.
+
+    See utils.hr_codec for the layout.
+    """
+    if len(payload) > max_payload_size(MAX_BATCH_SAMPLES):
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_SAMPLES} samples per batch")
+    try:
+        timestamps, bpm_values = decode_samples(payload)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     
-    return {
-        "total_readings": len(history),
-        "duration_seconds": sum(p[1] for p in phases),
-        "data": history
-    }
+    return ingest_samples(db, current_user.id, timestamps, bpm_values)
+
+
+@router.get("/ingest/metrics")
+def get_ingest_metrics(admin: User = Depends(require_admin)):
+    """
+    Get write-behind buffer queue depth and flush latency (Admin only).
+    """
+    return heart_rate_buffer.metrics()
+
+
+@router.get("/stream/metrics")
+def get_stream_metrics(admin: User = Depends(require_admin)):
+    """
+    Get live stream, subscriber and dropped-frame counts (Admin only).
+    """
+    return heart_rate_hub.metrics()
+
+
+@router.get("/simulate/{duration_seconds}")
+def generate_heart_rate_history(
+    duration_seconds: int = 3600,
+    format: str = Query("json", pattern="^(json|ndjson)$")
+):
+    """
+    Generate simulated heart rate history for testing.
+
+    Readings are generated lazily and streamed as they are produced.
+    """
+    if format == "ndjson":
+        return ndjson_response(simulate_history())
+
+    total = sum(p[1] for p in SIMULATION_PHASES)
+    return json_object_response(
+        {"total_readings": total, "duration_seconds": total},
+        "data",
+        simulate_history()
+    )
 
 
 @router.get("/anomalies")
@@ -96,7 +173,14 @@ def get_heart_rate_anomalies(
 ):
     """
     Detect and return heart rate anomalies for current user.
+
+    Users with live statistics get the precomputed detections from the
+    ingest path; otherwise the stored history is scanned once and used to
+    seed those statistics.
     """
+    if anomaly_monitor.is_tracking(current_user.id):
+        return anomaly_monitor.summary(current_user.id)
+
     # Get recent heart rate records
     records = db.query(HeartRate)\
         .filter(HeartRate.user_id == current_user.id)\
@@ -106,35 +190,47 @@ def get_heart_rate_anomalies(
     
     # If not enough data, generate sample data
     if len(records) < 10:
-        history_response = generate_heart_rate_history(1800)
-        history = history_response["data"]
+        history = list(simulate_history())
     else:
         history = [{"bpm": r.bpm, "timestamp": r.timestamp.isoformat()} for r in records]
     
     # Detect anomalies
     anomalies = detect_anomalies(history)
     
-    # Save anomalies to database
-    for anomaly in anomalies:
-        existing = db.query(Anomaly)\
-            .filter(Anomaly.user_id == current_user.id)\
-            .filter(Anomaly.type == "heart_rate")\
-            .first()
+    # Simulated demo data is neither tracked nor stored
+    if len(records) >= 10:
+        anomaly_monitor.warm(current_user.id, history, anomalies)
         
-        if not existing:
-            anom = Anomaly(
-                user_id=current_user.id,
-                type="heart_rate",
-                message=f"Anomalous heart rate detected: {anomaly.get('bpm')} BPM (z-score: {anomaly.get('z_score')})",
-                severity=anomaly.get('severity', 'medium'),
-                timestamp=datetime.now()
-            )
-            db.add(anom)
-    
-    db.commit()
+        # Save anomalies to database, skipping ones already stored
+        save_anomalies(db, [anomaly_row(current_user.id, a) for a in anomalies])
+        db.commit()
     
     return {
         "total_readings": len(history),
         "anomalies_detected": len(anomalies),
         "anomalies": anomalies
-    }
\ No newline at end of file
+    }
+
+
+def _stream_history(user_id: int, resolution: str, start: Optional[datetime], end: Optional[datetime]):
+    """Yield history points from a server-side cursor in batches."""
+    # Own session: the generator outlives the request dependency scope
+    db = SessionLocal()
+    try:
+        if resolution != "raw":
+            for r in rollup_query(db, user_id, resolution, start, end).yield_per(1000):
+                yield rollup_point(r)
+            return
+
+        query = db.query(HeartRate.id, HeartRate.user_id, HeartRate.bpm, HeartRate.timestamp)\
+            .filter(HeartRate.user_id == user_id)
+
+        if start:
+            query = query.filter(HeartRate.timestamp >= start)
+        if end:
+            query = query.filter(HeartRate.timestamp <= end)
+
+        for r in query.order_by(HeartRate.timestamp.desc()).yield_per(1000):
+            yield {"id": r.id, "user_id": r.user_id, "bpm": r.bpm, "timestamp": r.timestamp}
+    finally:
+        db.close()
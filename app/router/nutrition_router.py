@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, File, UploadFile, HTTPException
+from fastapi import APIRouter, Depends, Query, File, UploadFile, HTTPException
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Optional
 from datetime import datetime
 import httpx
 import base64
@@ -12,24 +12,26 @@ from core.dependencies import get_current_user
 from models.user import User
 from models.health import Nutrition
 from schemas.nutrition import NutritionCreate, NutritionResponse
+from schemas.pagination import Page
+from utils.pagination import paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/api/nutrition", tags=["Nutrition"])
 
 
-@router.get("", response_model=List[NutritionResponse])
+@router.get("", response_model=Page[NutritionResponse])
 def get_nutrition(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get all nutrition records for current user.
+    Get nutrition records for current user, newest first, one page at a time.
     """
-    nutrition = db.query(Nutrition)\
-        .filter(Nutrition.user_id == current_user.id)\
-        .order_by(Nutrition.date.desc())\
-        .all()
+    query = db.query(Nutrition)\
+        .filter(Nutrition.user_id == current_user.id)
     
-    return nutrition
+    return paginate(query, Nutrition.date, Nutrition.id, cursor, limit)
 
 
 @router.post("", response_model=NutritionResponse)
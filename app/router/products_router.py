@@ -1,79 +1,90 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from datetime import datetime
 from core.database import get_db
-from core.dependencies import get_current_user, require_admin
+from core.dependencies import get_token_claims, require_admin
 from models.user import User
 from models.product import Product
 from schemas.product import ProductCreate, ProductResponse
+from schemas.user import TokenClaims
+from schemas.pagination import Page
+from services.catalog_cache import catalog_cache
+from services.recommendation_service import (
+    recommendation_engine, user_segment, save_product_tags, delete_product_tags
+)
+from services.search_service import search_page
+from utils.http_cache import conditional_response
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/api/products", tags=["Products"])
 
 
-@router.get("", response_model=List[ProductResponse])
+@router.get("", response_model=Page[ProductResponse])
 def get_products(
+    request: Request,
+    response: Response,
     search: Optional[str] = None,
     category: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db)
 ):
-    query = db.query(Product)
+    if category == "ALL":
+        category = None
 
+    # Searches come back ranked by relevance instead of newest first
     if search:
-        query = query.filter(
-            (Product.name.ilike(f"%{search}%")) |
-            (Product.description.ilike(f"%{search}%"))
-        )
+        query = db.query(Product)
+        if category:
+            query = query.filter(Product.category == category)
+        return search_page(query, Product, search, cursor, limit)
 
-    if category and category != "ALL":
-        query = query.filter(Product.category == category)
+    # Plain browsing is served from the in-memory catalog
+    snapshot = catalog_cache.get(db)
+    not_modified = conditional_response(request, response, snapshot.etag)
+    if not_modified:
+        return not_modified
 
-    return query.order_by(Product.created_at.desc()).all()
+    return snapshot.page(category, cursor, limit)
 
 
 @router.get("/categories", response_model=List[str])
-def get_product_categories(db: Session = Depends(get_db)):
-    categories = db.query(Product.category).distinct().all()
-    return [c[0] for c in categories]
+def get_product_categories(request: Request, response: Response, db: Session = Depends(get_db)):
+    snapshot = catalog_cache.get(db)
+    not_modified = conditional_response(request, response, snapshot.etag)
+    if not_modified:
+        return not_modified
+
+    return snapshot.categories
 
 @router.get("/recommended")
 def get_recommended_products(
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ):
     """Get recommended products based on user profile"""
-    bmi = current_user.weight_kg / ((current_user.height_cm / 100) ** 2) if current_user.height_cm else 22
-    
-    products = db.query(Product).all()
-    recommended = []
-    
-    for product in products:
-        reason = None
-        if bmi < 18.5 and "protein" in product.name.lower():
-            reason = "Recommended for weight gain"
-        elif bmi >= 25 and "low-calorie" in product.description.lower():
-            reason = "Recommended for weight management"
-        elif current_user.goals and "muscle" in current_user.goals.lower() and "protein" in product.name.lower():
-            reason = "Supports muscle building goals"
-        
-        if reason:
-            product_dict = {
-                "id": product.id,
-                "name": product.name,
-                "description": product.description,
-                "price": product.price,
-                "category": product.category,
-                "image_url": product.image_url,
-                "created_at": product.created_at,
-                "recommendation_reason": reason
-            }
-            recommended.append(product_dict)
-    
-    return recommended[:5]
+    segment = user_segment(current_user.height_cm, current_user.weight_kg, current_user.goals)
+    return recommendation_engine.recommend(db, segment)
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
-def get_product_detail(product_id: int, db: Session = Depends(get_db)):
+def get_product_detail(
+    product_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    snapshot = catalog_cache.get(db)
+    product = snapshot.by_id.get(product_id)
+
+    if product:
+        not_modified = conditional_response(request, response, snapshot.etag)
+        if not_modified:
+            return not_modified
+        return product
+
+    # May have been created in another worker since the snapshot was built
     product = db.query(Product).filter(Product.id == product_id).first()
 
     if not product:
@@ -98,8 +109,11 @@ def create_product(
     )
 
     db.add(product)
+    db.flush()
+    save_product_tags(db, product)
     db.commit()
     db.refresh(product)
+    catalog_cache.invalidate()
     return product
 
 
@@ -114,8 +128,10 @@ def delete_product(
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     
+    delete_product_tags(db, product.id)
     db.delete(product)
     db.commit()
+    catalog_cache.invalidate()
     return {"message": "Product deleted"}
 
 
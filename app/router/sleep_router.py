@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Optional
 from datetime import datetime
 
 from core.database import get_db
@@ -8,24 +8,26 @@ from core.dependencies import get_current_user
 from models.user import User
 from models.health import Sleep
 from schemas.health import SleepCreate, SleepResponse
+from schemas.pagination import Page
+from utils.pagination import paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/api/sleep", tags=["Sleep"])
 
 
-@router.get("", response_model=List[SleepResponse])
+@router.get("", response_model=Page[SleepResponse])
 def get_sleep(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get all sleep records for current user.
+    Get sleep records for current user, newest first, one page at a time.
     """
-    sleep_records = db.query(Sleep)\
-        .filter(Sleep.user_id == current_user.id)\
-        .order_by(Sleep.date.desc())\
-        .all()
+    query = db.query(Sleep)\
+        .filter(Sleep.user_id == current_user.id)
     
-    return sleep_records
+    return paginate(query, Sleep.date, Sleep.id, cursor, limit)
 
 
 @router.post("", response_model=SleepResponse)
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from core.database import get_db
-from core.dependencies import get_current_user
+from core.dependencies import get_current_user, require_admin, user_cache
+from core.security import token_cache
 from models.user import User
 from schemas.user import UserResponse, UserUpdate
 
@@ -21,22 +22,39 @@ def update_profile(
     db: Session = Depends(get_db)
 ):
     """Update user profile"""
+    # current_user is a cached snapshot; load the row to modify
+    user = db.query(User).filter(User.id == current_user.id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
     if profile.name is not None:
-        current_user.name = profile.name
+        user.name = profile.name
     if profile.age is not None:
-        current_user.age = profile.age
+        user.age = profile.age
     if profile.height_cm is not None:
-        current_user.height_cm = profile.height_cm
+        user.height_cm = profile.height_cm
     if profile.weight_kg is not None:
-        current_user.weight_kg = profile.weight_kg
+        user.weight_kg = profile.weight_kg
     if profile.gender is not None:
-        current_user.gender = profile.gender
+        user.gender = profile.gender
     if profile.goals is not None:
-        current_user.goals = profile.goals
+        user.goals = profile.goals
     if profile.diet_type is not None:
-        current_user.diet_type = profile.diet_type
+        user.diet_type = profile.diet_type
+    # Access tokens issued before this change no longer carry the current profile
+    user.profile_version = User.profile_version + 1
     
     db.commit()
-    db.refresh(current_user)
+    db.refresh(user)
+    user_cache.invalidate(user.id)
     
-    return current_user
+    return user
+
+
+@router.get("/cache/metrics")
+def get_user_cache_metrics(admin: User = Depends(require_admin)):
+    """Get authenticated user and token cache hit rates (Admin only)"""
+    return {
+        "users": user_cache.metrics(),
+        "tokens": token_cache.metrics()
+    }
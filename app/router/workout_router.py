@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Optional
 from datetime import datetime
 
 from core.database import get_db
@@ -8,24 +8,26 @@ from core.dependencies import get_current_user
 from models.user import User
 from models.health import Workout
 from schemas.workout import WorkoutCreate, WorkoutResponse
+from schemas.pagination import Page
+from utils.pagination import paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/api/workouts", tags=["Workouts"])
 
 
-@router.get("", response_model=List[WorkoutResponse])
+@router.get("", response_model=Page[WorkoutResponse])
 def get_workouts(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get all workouts for current user.
+    Get workouts for current user, newest first, one page at a time.
     """
-    workouts = db.query(Workout)\
-        .filter(Workout.user_id == current_user.id)\
-        .order_by(Workout.date.desc())\
-        .all()
+    query = db.query(Workout)\
+        .filter(Workout.user_id == current_user.id)
     
-    return workouts
+    return paginate(query, Workout.date, Workout.id, cursor, limit)
 
 
 @router.post("", response_model=WorkoutResponse)
@@ -1,10 +1,18 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional, Tuple
 from datetime import datetime, date
+from core.config import settings
 
 
 class HeartRateCreate(BaseModel):
     bpm: int
+    # Device time of the reading; the server time is used when omitted
+    timestamp: Optional[datetime] = None
+
+
+class HeartRateBatchCreate(BaseModel):
+    # (timestamp, bpm) pairs
+    samples: List[Tuple[datetime, int]] = Field(..., max_length=settings.HEART_RATE_MAX_BATCH_SAMPLES)
 
 
 class HeartRateResponse(BaseModel):
@@ -17,6 +25,14 @@ class HeartRateResponse(BaseModel):
         from_attributes = True
 
 
+class HeartRateRollupResponse(BaseModel):
+    timestamp: datetime
+    min_bpm: int
+    max_bpm: int
+    mean_bpm: float
+    count: int
+
+
 class SleepCreate(BaseModel):
     hours: float
     quality: int
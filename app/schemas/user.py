@@ -46,7 +46,45 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+class CurrentUser(BaseModel):
+    """Immutable snapshot of the authenticated user, safe to cache."""
+    id: int
+    name: str
+    email: str
+    age: Optional[int] = None
+    height_cm: Optional[float] = None
+    weight_kg: Optional[float] = None
+    gender: Optional[str] = None
+    goals: Optional[str] = None
+    diet_type: Optional[str] = None
+    role: str
+    profile_version: int = 0
+    
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
+class TokenClaims(BaseModel):
+    """User fields carried in the access token, valid while its profile version is current."""
+    id: int
+    role: str
+    height_cm: Optional[float] = None
+    weight_kg: Optional[float] = None
+    goals: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
 class TokenResponse(BaseModel):
     access_token: str
+    refresh_token: str
     token_type: str
+    expires_in: int
     user: UserResponse
\ No newline at end of file
@@ -0,0 +1,155 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from core.config import settings
+from utils.image_hash import HASH_BITS, ImageFingerprint, hamming_distance
+
+# Perceptual hashes this close count as the same photo. The hash is split
+# into one more band than this, so a match always shares at least one band
+# exactly and can be found through the band indexes.
+PHASH_MAX_DISTANCE = 3
+PHASH_BANDS = PHASH_MAX_DISTANCE + 1
+BAND_BITS = HASH_BITS // PHASH_BANDS
+
+
+def _bands(phash: int) -> List[int]:
+    mask = (1 << BAND_BITS) - 1
+    return [(phash >> (i * BAND_BITS)) & mask for i in range(PHASH_BANDS)]
+
+
+class AnalysisCache:
+    """
+    On-disk cache of AI image analysis results, addressed by image content.
+
+    Results are found by exact SHA-256 of the image bytes first, then by a
+    nearby perceptual hash, so re-uploads of the same photo skip the model.
+    Entries expire after a TTL and the least recently used are evicted once
+    the cache is full. The store is a separate SQLite file shared by all
+    worker processes.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.AI_CACHE_PATH,
+        max_entries: int = settings.AI_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = settings.AI_CACHE_TTL_SECONDS
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite file holding the cache
+            max_entries: Entries kept before the least recently used are evicted
+            ttl_seconds: Lifetime of an entry
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.perceptual_hits = 0
+        self.misses = 0
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        band_columns = "".join(f", band{i} INTEGER" for i in range(PHASH_BANDS))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS analysis ("
+            "namespace TEXT NOT NULL, sha256 TEXT NOT NULL, phash TEXT"
+            f"{band_columns}, result TEXT NOT NULL, created_at REAL NOT NULL, "
+            "last_used REAL NOT NULL, PRIMARY KEY (namespace, sha256))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_analysis_last_used ON analysis (last_used)")
+        for i in range(PHASH_BANDS):
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_analysis_band{i} ON analysis (namespace, band{i})"
+            )
+
+    def get(self, namespace: str, fingerprint: ImageFingerprint) -> Optional[Dict]:
+        """Return a cached result for the image, or None."""
+        now = time.time()
+        oldest = now - self.ttl_seconds
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha256, result FROM analysis "
+                "WHERE namespace = ? AND sha256 = ? AND created_at > ?",
+                (namespace, fingerprint.sha256, oldest)
+            ).fetchone()
+            if row:
+                self.exact_hits += 1
+            elif fingerprint.phash is not None:
+                row = self._find_similar(namespace, fingerprint.phash, oldest)
+                if row:
+                    self.perceptual_hits += 1
+
+            if not row:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE analysis SET last_used = ? WHERE namespace = ? AND sha256 = ?",
+                (now, namespace, row[0])
+            )
+            return json.loads(row[1])
+
+    def _find_similar(self, namespace: str, phash: int, oldest: float):
+        bands = _bands(phash)
+        match_any = " OR ".join(f"band{i} = ?" for i in range(PHASH_BANDS))
+        candidates = self._conn.execute(
+            f"SELECT sha256, result, phash FROM analysis "
+            f"WHERE namespace = ? AND created_at > ? AND ({match_any})",
+            (namespace, oldest, *bands)
+        ).fetchall()
+
+        best = None
+        for sha256, result, other in candidates:
+            distance = hamming_distance(phash, int(other, 16))
+            if distance <= PHASH_MAX_DISTANCE and (best is None or distance < best[0]):
+                best = (distance, sha256, result)
+        return best[1:] if best else None
+
+    def set(self, namespace: str, fingerprint: ImageFingerprint, result: Dict):
+        """Store a result, dropping expired entries and evicting the least recently used."""
+        now = time.time()
+        phash = fingerprint.phash
+        bands = _bands(phash) if phash is not None else [None] * PHASH_BANDS
+        band_columns = "".join(f", band{i}" for i in range(PHASH_BANDS))
+
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO analysis (namespace, sha256, phash{band_columns}, "
+                f"result, created_at, last_used) VALUES ({', '.join('?' * (PHASH_BANDS + 6))})",
+                (
+                    namespace, fingerprint.sha256,
+                    format(phash, "016x") if phash is not None else None,
+                    *bands, json.dumps(result), now, now
+                )
+            )
+            self._conn.execute("DELETE FROM analysis WHERE created_at <= ?", (now - self.ttl_seconds,))
+            self._conn.execute(
+                "DELETE FROM analysis WHERE rowid IN ("
+                "SELECT rowid FROM analysis ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def metrics(self) -> Dict:
+        """Return size and hit-rate statistics."""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM analysis").fetchone()[0]
+            hits = self.exact_hits + self.perceptual_hits
+            lookups = hits + self.misses
+            return {
+                "size": size,
+                "max_entries": self.max_entries,
+                "exact_hits": self.exact_hits,
+                "perceptual_hits": self.perceptual_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+            }
+
+
+analysis_cache = AnalysisCache()
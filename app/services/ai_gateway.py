@@ -0,0 +1,229 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import aclosing
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, TypeVar
+
+from core.config import settings
+
+T = TypeVar("T")
+
+LATENCY_WINDOW = 500
+
+
+class CircuitOpenError(Exception):
+    """The upstream model is failing; the call was not attempted."""
+
+
+class AIGateway:
+    """
+    Shared front door for outbound model calls.
+
+    - A semaphore caps concurrent upstream calls; the rest queue.
+    - Every call has a deadline covering queueing and the call itself.
+    - Identical calls already in flight are coalesced into one (streamed
+      calls are not: each caller consumes its own stream).
+    - After repeated failures a circuit breaker rejects calls instantly,
+      so callers serve their fallback instead of waiting on a dead
+      upstream. After a cool-down one trial call is let through; success
+      closes the circuit again.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = settings.AI_MAX_CONCURRENCY,
+        timeout_seconds: float = settings.AI_TIMEOUT_SECONDS,
+        failure_threshold: int = settings.AI_BREAKER_FAILURE_THRESHOLD,
+        reset_seconds: float = settings.AI_BREAKER_RESET_SECONDS
+    ):
+        """
+        Initialize the gateway.
+
+        Args:
+            max_concurrency: Upstream calls allowed at once
+            timeout_seconds: Deadline per call, including time spent queued
+            failure_threshold: Consecutive failures that open the circuit
+            reset_seconds: Time the circuit stays open before a trial call
+        """
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        # Breaker state is read and written without a lock. That is only safe
+        # because every access happens on the event loop thread, between
+        # awaits; never touch it from run_db or process pool work.
+        self.state = "closed"
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+
+        self.calls = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    async def call(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run func() through the gateway.
+
+        Callers passing the same key while a call is in flight share its
+        result (or exception) instead of making another upstream call.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            TimeoutError: If the deadline passed
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            if not self._allow():
+                self.rejected += 1
+                raise CircuitOpenError("AI upstream unavailable")
+
+            task = asyncio.create_task(self._run(func))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+
+        # A caller that disconnects must not cancel the call for the others
+        return await asyncio.shield(task)
+
+    def _finished(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every waiter went away
+            task.exception()
+
+    async def _run(self, func: Callable[[], Awaitable[T]]) -> T:
+        started = time.monotonic()
+        self.calls += 1
+        try:
+            async with asyncio.timeout(self.timeout_seconds):
+                async with self._semaphore:
+                    result = await func()
+        except TimeoutError:
+            self.timeouts += 1
+            self._record_failure()
+            raise
+        except Exception:
+            self.errors += 1
+            self._record_failure()
+            raise
+
+        self._latencies.append(time.monotonic() - started)
+        self._record_success()
+        return result
+
+    async def stream(self, func: Callable[[], Awaitable[AsyncIterator[T]]]) -> AsyncIterator[T]:
+        """
+        Run a streaming call through the gateway, yielding its chunks.
+
+        The call holds a concurrency slot until the stream is finished or
+        abandoned, and the deadline covers the whole stream.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            TimeoutError: If the deadline passed before the stream ended
+        """
+        if not self._allow():
+            self.rejected += 1
+            raise CircuitOpenError("AI upstream unavailable")
+
+        started = time.monotonic()
+        deadline = asyncio.get_running_loop().time() + self.timeout_seconds
+        self.calls += 1
+        try:
+            async with asyncio.timeout_at(deadline):
+                await self._semaphore.acquire()
+            try:
+                async with asyncio.timeout_at(deadline):
+                    chunks = await func()
+                async with aclosing(chunks):
+                    while True:
+                        # A timeout scope must not span the yield, or it
+                        # would cancel whatever the caller is doing
+                        async with asyncio.timeout_at(deadline):
+                            try:
+                                chunk = await anext(chunks)
+                            except StopAsyncIteration:
+                                break
+                        yield chunk
+            finally:
+                self._semaphore.release()
+        except TimeoutError:
+            self.timeouts += 1
+            self._record_failure()
+            raise
+        except Exception:
+            self.errors += 1
+            self._record_failure()
+            raise
+        except BaseException:
+            # Abandoned by the caller: no verdict on upstream health
+            self._trial_running = False
+            raise
+
+        self._latencies.append(time.monotonic() - started)
+        self._record_success()
+
+    @staticmethod
+    def _check_on_loop():
+        # Raises RuntimeError when called off the event loop thread
+        asyncio.get_running_loop()
+
+    def _allow(self) -> bool:
+        self._check_on_loop()
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_seconds:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._trial_running:
+            self._trial_running = True
+            return True
+        return False
+
+    def _record_success(self):
+        self._check_on_loop()
+        self._consecutive_failures = 0
+        self._trial_running = False
+        self.state = "closed"
+
+    def _record_failure(self):
+        self._check_on_loop()
+        self._consecutive_failures += 1
+        if self.state == "half_open" or self._consecutive_failures >= self.failure_threshold:
+            self.state = "open"
+            self._opened_at = time.monotonic()
+        self._trial_running = False
+
+    def metrics(self) -> Dict:
+        """Return call counts, circuit state and recent latency percentiles."""
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1)
+
+        return {
+            "state": self.state,
+            "in_flight": len(self._inflight),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "latency_p50_ms": percentile(0.5),
+            "latency_p95_ms": percentile(0.95),
+            "latency_p99_ms": percentile(0.99)
+        }
+
+
+ai_gateway = AIGateway()
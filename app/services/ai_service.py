@@ -1,41 +1,98 @@
+import asyncio
 import base64
+import hashlib
 import json
-from typing import List
+from contextlib import aclosing
+from typing import AsyncIterator, List, Tuple
 from fastapi import HTTPException, UploadFile
 from sqlalchemy.orm import Session
 from core.config import settings
+from core.process_pool import ProcessPool
 from models.user import User
 from models.health import Workout, Sleep
-from schemas.ai import NutritionData,WorkoutPlan
+from schemas.ai import NutritionData,WorkoutPlan,DailyPlan
+from services.ai_cache import analysis_cache
+from services.ai_gateway import ai_gateway, CircuitOpenError
+from services.fake_gemini import FakeGeminiClient
+from utils.image_preprocess import prepare_image
+from utils.json_stream import JsonArrayItems
 
 from google import genai
 from google.genai import types
 
 
+# Cached analyses are only reused for the same model, prompt and preprocessing
+FOOD_ANALYSIS_NAMESPACE = "gemini-2.5-flash:nutrition:v2"
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+# Decoding and re-encoding photos runs in its own worker processes
+image_pool = ProcessPool(max_workers=settings.IMAGE_WORKERS)
+
+
+def _create_gemini_client():
+    if settings.GEMINI_CLIENT == "fake":
+        return FakeGeminiClient(latency_seconds=settings.FAKE_GEMINI_LATENCY_SECONDS)
+    try:
+        return genai.Client(api_key=settings.GEMINI_API_KEY)
+    except Exception as e:
+        # Handle case where API key is not configured or client fails to initialize
+        print(f"Error initializing Gemini client: {e}")
+        return None
+
+
 # Initialize the Gemini Client
-try:
-    gemini_client = genai.Client(api_key=settings.GEMINI_API_KEY)
-except Exception as e:
-    # Handle case where API key is not configured or client fails to initialize
-    print(f"Error initializing Gemini client: {e}")
-    gemini_client = None
+gemini_client = _create_gemini_client()
+
+
+async def _read_upload(file: UploadFile, max_bytes: int) -> bytes:
+    """
+    Read an upload in chunks, rejecting it if the file passes max_bytes.
+
+    The body has already been received by now; UploadLimitMiddleware is what
+    stops oversized requests early. This enforces the exact file size and
+    keeps a single oversized read out of memory.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Image larger than {max_bytes} bytes")
+
+    chunks = []
+    size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Image larger than {max_bytes} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
 
 
 async def analyze_food_image(file: UploadFile):
     """Analyze food image using the Gemini Vision model (gemini-2.5-flash)"""
     
     # Check for client availability
-    if not settings.GEMINI_API_KEY or not gemini_client:
+    if not gemini_client:
         raise HTTPException(status_code=400, detail="Gemini API key not configured or client failed to initialize")
     
-    # Read file content
-    contents = await file.read()
+    # Read file content, up to the size cap
+    contents = await _read_upload(file, settings.IMAGE_MAX_UPLOAD_BYTES)
+
+    # Downscale, strip metadata and fingerprint in a worker process
+    try:
+        image = await image_pool.run(prepare_image, contents, settings.IMAGE_MAX_DIMENSION)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    del contents
+
+    # Same or near-identical photo analyzed before: skip the model call
+    cached = await asyncio.to_thread(analysis_cache.get, FOOD_ANALYSIS_NAMESPACE, image.fingerprint)
+    if cached is not None:
+        return cached
     
     # Create the image Part for the multimodal prompt
     # Since we have the raw bytes and MIME type, Part.from_bytes is the appropriate method.
     image_part = types.Part.from_bytes(
-        data=contents,
-        mime_type=file.content_type  # e.g., "image/jpeg"
+        data=image.data,
+        mime_type=image.mime_type  # e.g., "image/jpeg"
     )
 
     text_prompt = (
@@ -46,7 +103,7 @@ async def analyze_food_image(file: UploadFile):
         "Be precise in your estimates and use the universal values. Also include a short, personalized health tip."
     )
     
-    try:
+    async def analyze():
         response = await gemini_client.aio.models.generate_content(
             model='gemini-2.5-flash',
             contents=[text_prompt, image_part],
@@ -56,13 +113,22 @@ async def analyze_food_image(file: UploadFile):
                 temperature=0.1 
             )
         )
+        return NutritionData.model_validate_json(response.text).model_dump()
+    
+    try:
+        # Uploads of the same photo in flight at once share a single call
+        nutrition_data = await ai_gateway.call(
+            f"{FOOD_ANALYSIS_NAMESPACE}:{image.fingerprint.sha256}", analyze
+        )
         
-        nutrition_data = NutritionData.model_validate_json(response.text).model_dump()
+        # Only real analyses are cached, never the error fallback
+        await asyncio.to_thread(analysis_cache.set, FOOD_ANALYSIS_NAMESPACE, image.fingerprint, nutrition_data)
         
         return nutrition_data
     
     except Exception as e:
-        print(f"Gemini API or JSON parsing error: {e}")
+        if not isinstance(e, CircuitOpenError):
+            print(f"Gemini API or JSON parsing error: {e!r}")
         return {
             "food_name": "Unknown (Gemini API error)",
             "calories": 0,
@@ -73,18 +139,28 @@ async def analyze_food_image(file: UploadFile):
         }
 
 
-async def generate_workout_plan(user: User, db: Session):
-    """Generate personalized workout plan using the Gemini API"""
+# Plan served when the Gemini client is not configured
+WORKOUT_PLAN_FALLBACK = {
+    "daily": "30 min cardio + strength training",
+    "weekly": "5 days workout, 2 days rest",
+    "monthly": "Progressive overload program",
+    "tips": ["Stay hydrated", "Get enough sleep", "Track your progress"]
+}
 
-    # Fallback plan if API is not configured
-    if not settings.GEMINI_API_KEY or not gemini_client:
-        return {
-            "daily": "30 min cardio + strength training",
-            "weekly": "5 days workout, 2 days rest",
-            "monthly": "Progressive overload program",
-            "tips": ["Stay hydrated", "Get enough sleep", "Track your progress"]
-        }
+# Plan served when generation fails
+WORKOUT_PLAN_ERROR_FALLBACK = {
+    **WORKOUT_PLAN_FALLBACK,
+    "daily": "30 min cardio + strength training (API error fallback)"
+}
 
+
+def workout_plan_inputs(user: User, db: Session) -> dict:
+    """
+    Collect everything the workout plan prompt depends on.
+
+    Values are rounded the way the prompt prints them, so inputs that
+    produce the same prompt compare equal.
+    """
     # Calculate BMI (assuming user.height_cm and user.weight_kg are available)
     bmi = user.weight_kg / ((user.height_cm / 100) ** 2) if user.height_cm else 0
     
@@ -94,15 +170,27 @@ async def generate_workout_plan(user: User, db: Session):
     
     avg_sleep = sum([s.hours for s in sleep_records]) / len(sleep_records) if sleep_records else 7
     
+    return {
+        "age": user.age,
+        "height_cm": user.height_cm,
+        "weight_kg": user.weight_kg,
+        "bmi": round(bmi, 1),
+        "goals": user.goals or 'general fitness',
+        "avg_sleep": round(avg_sleep, 1),
+        "workout_count": len(workouts)
+    }
+
+
+def _workout_plan_prompt(inputs: dict) -> str:
     # Construct a detailed prompt
-    prompt = f"""
+    return f"""
     Based on the following user data, generate a complete, 7-day personalized workout plan.
-    - Age: {user.age}
-    - Height: {user.height_cm}cm, Weight: {user.weight_kg}kg
-    - BMI: {bmi:.1f}
-    - Goals: {user.goals or 'general fitness'}
-    - Average sleep: {avg_sleep:.1f} hours
-    - Recent workouts: {len(workouts)} logged
+    - Age: {inputs["age"]}
+    - Height: {inputs["height_cm"]}cm, Weight: {inputs["weight_kg"]}kg
+    - BMI: {inputs["bmi"]:.1f}
+    - Goals: {inputs["goals"]}
+    - Average sleep: {inputs["avg_sleep"]:.1f} hours
+    - Recent workouts: {inputs["workout_count"]} logged
 
     **The plan must be structured into a 4-week progression model.**
 
@@ -116,29 +204,68 @@ async def generate_workout_plan(user: User, db: Session):
 
     Provide the entire plan in JSON format strictly following the provided WorkoutPlan schema.
     """
-            
-    try:
+
+
+WORKOUT_PLAN_CONFIG = types.GenerateContentConfig(
+    response_mime_type="application/json",
+    response_schema=WorkoutPlan, 
+    temperature=1
+)
+
+
+async def generate_workout_plan(inputs: dict) -> dict:
+    """
+    Generate personalized workout plan using the Gemini API.
+
+    Raises:
+        Exception: If the API call or parsing fails, or the circuit is open
+    """
+    prompt = _workout_plan_prompt(inputs)
+    
+    async def generate():
         response = await gemini_client.aio.models.generate_content(
             model='gemini-2.5-flash',
             contents=prompt, # The detailed prompt
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                response_schema=WorkoutPlan, 
-                temperature=1
-            )
+            config=WORKOUT_PLAN_CONFIG
         )
         
         # The SDK ensures the response.text is valid JSON matching the schema
-        plan = WorkoutPlan.model_validate_json(response.text).model_dump()
-        
-        return plan
+        return WorkoutPlan.model_validate_json(response.text).model_dump()
     
-    except Exception as e:
-        print(f"Gemini API or JSON parsing error: {e}")
-        # Fallback plan on failure
-        return {
-            "daily": "30 min cardio + strength training (API error fallback)",
-            "weekly": "5 days workout, 2 days rest",
-            "monthly": "Progressive overload program",
-            "tips": ["Stay hydrated", "Get enough sleep", "Track your progress"]
-        }
\ No newline at end of file
+    # Identical prompts in flight at once share a single generation
+    key = "workout-plan:" + hashlib.sha256(prompt.encode()).hexdigest()
+    return await ai_gateway.call(key, generate)
+
+
+async def stream_workout_plan(inputs: dict) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    Generate personalized workout plan, yielding it as it is written.
+
+    Yields ("day", DailyPlan) for each day of `daily_plan` as soon as the
+    model has finished writing it, then ("plan", WorkoutPlan) once the
+    whole response is in.
+
+    Raises:
+        Exception: If the API call or parsing fails, or the circuit is open
+    """
+    prompt = _workout_plan_prompt(inputs)
+
+    async def open_stream():
+        return await gemini_client.aio.models.generate_content_stream(
+            model='gemini-2.5-flash',
+            contents=prompt,
+            config=WORKOUT_PLAN_CONFIG
+        )
+
+    days = JsonArrayItems("daily_plan")
+    text = []
+    # Closing this generator early must close the upstream stream too
+    async with aclosing(ai_gateway.stream(open_stream)) as chunks:
+        async for chunk in chunks:
+            if not chunk.text:
+                continue
+            text.append(chunk.text)
+            for day in days.feed(chunk.text):
+                yield "day", DailyPlan.model_validate_json(day).model_dump()
+
+    yield "plan", WorkoutPlan.model_validate_json("".join(text)).model_dump()
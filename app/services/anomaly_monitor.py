@@ -0,0 +1,120 @@
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from models.health import HeartRate
+from utils.anamoly_detection import RollingAnomalyDetector, detect_anomalies
+
+
+class AnomalyMonitor:
+    """
+    Per-user online anomaly detection shared by the heart rate ingest paths.
+
+    Every ingested sample is scored as it arrives, and the most recent
+    detections are kept so polling clients get precomputed results. A
+    user's statistics are seeded from stored history before their first
+    live sample, so a restart does not reset them.
+    """
+
+    def __init__(self, window: int = 5000, history_size: int = 100):
+        """
+        Initialize the monitor.
+
+        Args:
+            window: Number of recent samples each user's statistics cover
+            history_size: Number of recent detections kept per user
+        """
+        self.window = window
+        self.history_size = history_size
+
+        self._detectors: Dict[int, RollingAnomalyDetector] = {}
+        self._recent: Dict[int, Deque[Dict]] = {}
+        # Users whose statistics were seeded from stored history
+        self._warmed: Set[int] = set()
+        # The WebSocket loop and sync endpoints in the thread pool share state
+        self._lock = threading.Lock()
+
+    def _state(self, user_id: int) -> RollingAnomalyDetector:
+        detector = self._detectors.get(user_id)
+        if detector is None:
+            detector = RollingAnomalyDetector(window=self.window)
+            self._detectors[user_id] = detector
+            self._recent[user_id] = deque(maxlen=self.history_size)
+        return detector
+
+    def is_tracking(self, user_id: int) -> bool:
+        """Whether the user has live statistics, seeded from history, in this process."""
+        with self._lock:
+            return user_id in self._warmed
+
+    def ensure_warm(self, db: Session, user_id: int, before_id: Optional[int] = None):
+        """
+        Seed a user's statistics from stored history if not done yet.
+
+        Call before observing a user's samples.
+
+        Args:
+            before_id: Only use readings with a smaller id, e.g. to leave out
+                a batch just inserted that is about to be observed
+        """
+        if self.is_tracking(user_id):
+            return
+
+        query = db.query(HeartRate.bpm, HeartRate.timestamp)\
+            .filter(HeartRate.user_id == user_id)
+        if before_id is not None:
+            query = query.filter(HeartRate.id < before_id)
+        records = query.order_by(HeartRate.timestamp.desc()).limit(self.window).all()
+
+        history = [{"bpm": r.bpm, "timestamp": r.timestamp.isoformat()} for r in records]
+        self.warm(user_id, history, detect_anomalies(history))
+
+    def observe(self, user_id: int, bpm: int, timestamp: datetime) -> Optional[Dict]:
+        """
+        Score a new sample in O(1).
+
+        Returns:
+            The anomaly dict if the sample is anomalous, otherwise None
+        """
+        with self._lock:
+            anomaly = self._state(user_id).update(bpm, timestamp.isoformat())
+            if anomaly:
+                self._recent[user_id].append(anomaly)
+            return anomaly
+
+    def warm(self, user_id: int, history: List[Dict], anomalies: List[Dict]):
+        """
+        Seed a user's statistics from stored history.
+
+        Args:
+            history: Readings with 'bpm' key, newest first
+            anomalies: Detections over the same history, newest first
+        """
+        with self._lock:
+            if user_id in self._warmed:
+                return
+            # Start from the stored history alone; it already covers any
+            # samples observed before warming
+            self._detectors.pop(user_id, None)
+            detector = self._state(user_id)
+            for reading in reversed(history):
+                detector.add(reading["bpm"])
+            self._recent[user_id].extend(reversed(anomalies[:self.history_size]))
+            self._warmed.add(user_id)
+
+    def summary(self, user_id: int) -> Dict:
+        """Return the precomputed anomaly summary for a user."""
+        with self._lock:
+            detector = self._state(user_id)
+            anomalies = list(reversed(self._recent[user_id]))
+            return {
+                "total_readings": detector.count,
+                "anomalies_detected": len(anomalies),
+                "anomalies": anomalies
+            }
+
+
+anomaly_monitor = AnomalyMonitor()
@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+from core.database import dialect_insert
+from models.health import Anomaly
+
+# Rows per INSERT statement, well under SQLite's bound-parameter limit
+INSERT_CHUNK_SIZE = 500
+
+
+def anomaly_row(user_id: int, anomaly: Dict, type: str = "heart_rate") -> Dict:
+    """
+    Build an Anomaly table row from a detection.
+
+    The timestamp is truncated to the second so the same sample always
+    maps to the same (user, type, timestamp) natural key.
+    """
+    timestamp = anomaly.get("timestamp")
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+
+    return {
+        "user_id": user_id,
+        "type": type,
+        "message": f"Anomalous heart rate detected: {anomaly.get('bpm')} BPM (z-score: {anomaly.get('z_score')})",
+        "severity": anomaly.get("severity", "medium"),
+        "timestamp": (timestamp or datetime.now()).replace(microsecond=0)
+    }
+
+
+def save_anomalies(db: Session, rows: List[Dict]):
+    """
+    Insert anomaly rows, ignoring any that are already stored.
+
+    Uses a multi-row INSERT ... ON CONFLICT DO NOTHING on the natural key,
+    so a batch costs one statement instead of a lookup per anomaly. The
+    caller owns the transaction; nothing is committed here.
+    """
+    for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+        stmt = dialect_insert(Anomaly)\
+            .values(rows[i:i + INSERT_CHUNK_SIZE])\
+            .on_conflict_do_nothing(index_elements=["user_id", "type", "timestamp"])
+        db.execute(stmt)
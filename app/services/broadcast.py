@@ -0,0 +1,193 @@
+import asyncio
+import fcntl
+import os
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Set
+
+from core.config import settings
+
+Deliver = Callable[[int, str], None]
+
+RECONNECT_DELAY_SECONDS = 1.0
+# How long the broker waits for a peer to take a frame before dropping it
+PEER_DRAIN_TIMEOUT_SECONDS = 5.0
+
+
+class BroadcastBackend(ABC):
+    """
+    Transport between heart rate producers and the hubs holding sockets.
+
+    Published frames are handed to `deliver(user_id, message)` in every
+    process attached to the backend.
+    """
+
+    async def start(self, deliver: Deliver):
+        self._deliver = deliver
+
+    async def stop(self):
+        pass
+
+    @abstractmethod
+    async def publish(self, user_id: int, message: str):
+        """Send a frame to every attached process."""
+
+    def try_acquire_producer(self, user_id: int) -> bool:
+        """Claim the right to produce a user's stream; False if another worker holds it."""
+        return True
+
+    def release_producer(self, user_id: int):
+        pass
+
+
+class InProcessBroadcast(BroadcastBackend):
+    """Single-process backend: frames go straight to the local hub."""
+
+    async def publish(self, user_id: int, message: str):
+        self._deliver(user_id, message)
+
+
+class UnixSocketBroadcast(BroadcastBackend):
+    """
+    Cross-process backend over a local Unix socket.
+
+    The first worker to take the election lock runs a small broker that
+    relays every frame to all connected workers, itself included. Per-user
+    lock files make sure only one worker produces each user's stream.
+    """
+
+    def __init__(self, path: str = settings.BROADCAST_SOCKET_PATH):
+        """
+        Initialize the backend.
+
+        Args:
+            path: Filesystem path of the broker socket, shared by all workers
+        """
+        self.path = path
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._broker_lock: Optional[int] = None
+        self._peers: Set[asyncio.StreamWriter] = set()
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+        self._producer_locks: Dict[int, int] = {}
+
+    async def start(self, deliver: Deliver):
+        await super().start(deliver)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        for user_id in list(self._producer_locks):
+            self.release_producer(user_id)
+
+        if self._server:
+            self._server.close()
+            for peer in list(self._peers):
+                peer.close()
+            await self._server.wait_closed()
+            self._server = None
+            os.close(self._broker_lock)
+            self._broker_lock = None
+
+    async def publish(self, user_id: int, message: str):
+        if self._writer is None:
+            # Not attached to a broker right now: local viewers still get the frame
+            self._deliver(user_id, message)
+            return
+        self._writer.write(f"{user_id} {message}\n".encode())
+
+    def try_acquire_producer(self, user_id: int) -> bool:
+        if user_id in self._producer_locks:
+            return True
+        fd = self._try_lock(f"{self.path}.user-{user_id}.lock")
+        if fd is None:
+            return False
+        self._producer_locks[user_id] = fd
+        return True
+
+    def release_producer(self, user_id: int):
+        fd = self._producer_locks.pop(user_id, None)
+        if fd is not None:
+            os.close(fd)
+
+    @staticmethod
+    def _try_lock(lock_path: str) -> Optional[int]:
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        return fd
+
+    async def _run(self):
+        while True:
+            try:
+                await self._elect_broker()
+                reader, self._writer = await asyncio.open_unix_connection(self.path)
+                while line := await reader.readline():
+                    self._receive(line)
+            except (OSError, ValueError) as e:
+                # ValueError: a line longer than the stream limit
+                print(f"Broadcast connection error: {e}")
+            finally:
+                if self._writer:
+                    self._writer.close()
+                self._writer = None
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    def _receive(self, line: bytes):
+        """Deliver one "<user_id> <message>" frame, skipping malformed ones."""
+        try:
+            user_id, message = line.decode().rstrip("\n").split(" ", 1)
+            user_id = int(user_id)
+        except ValueError:
+            print(f"Skipping malformed broadcast frame: {line[:80]!r}")
+            return
+        self._deliver(user_id, message)
+
+    async def _elect_broker(self):
+        if self._server:
+            return
+        # The lock is held for the broker's lifetime and released by the OS if it dies
+        self._broker_lock = self._try_lock(f"{self.path}.lock")
+        if self._broker_lock is None:
+            return
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._handle_peer, path=self.path)
+
+    async def _handle_peer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._peers.add(writer)
+        try:
+            while line := await reader.readline():
+                peers = list(self._peers)
+                for peer in peers:
+                    peer.write(line)
+                await asyncio.gather(*(self._drain_peer(peer) for peer in peers))
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._peers.discard(writer)
+            writer.close()
+
+    async def _drain_peer(self, peer: asyncio.StreamWriter):
+        """Wait for a peer to take its frames; drop it if it can't keep up."""
+        try:
+            await asyncio.wait_for(peer.drain(), PEER_DRAIN_TIMEOUT_SECONDS)
+        except (OSError, asyncio.TimeoutError):
+            if peer in self._peers:
+                print("Dropping broadcast peer that stopped reading")
+                self._peers.discard(peer)
+                peer.close()
+
+
+def create_broadcast_backend() -> BroadcastBackend:
+    """Build the backend selected by BROADCAST_BACKEND ("memory" or "unix")."""
+    if settings.BROADCAST_BACKEND == "unix":
+        return UnixSocketBroadcast()
+    return InProcessBroadcast()
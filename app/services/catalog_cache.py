@@ -0,0 +1,130 @@
+import hashlib
+import json
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models.product import Product
+from schemas.product import ProductResponse
+from utils.pagination import encode_cursor, decode_cursor, DEFAULT_PAGE_SIZE
+
+ALL_CATEGORIES = "ALL"
+
+
+def _sort_key(product: ProductResponse) -> Tuple[datetime, int]:
+    return (product.created_at or datetime.min, product.id)
+
+
+class CatalogSnapshot:
+    """
+    Immutable view of the whole product catalog.
+
+    Products are kept oldest first, both overall and per category, so a
+    cursor page is a bisect plus a slice. Readers holding a snapshot keep
+    a consistent view while a newer one replaces it.
+    """
+
+    def __init__(self, products: List[ProductResponse]):
+        products = sorted(products, key=_sort_key)
+
+        self.by_id: Dict[int, ProductResponse] = {p.id: p for p in products}
+        self.categories: List[str] = sorted({p.category for p in products})
+
+        self._views: Dict[str, List[ProductResponse]] = {ALL_CATEGORIES: products}
+        for product in products:
+            self._views.setdefault(product.category, []).append(product)
+        self._keys = {
+            category: [_sort_key(p) for p in view]
+            for category, view in self._views.items()
+        }
+
+        # Content hash, so every worker serves the same ETag for the same catalog
+        digest = hashlib.sha256(json.dumps(
+            [p.model_dump(mode="json") for p in products]
+        ).encode()).hexdigest()
+        self.etag = f'W/"{digest[:16]}"'
+        self.built_at = time.monotonic()
+
+    def page(
+        self,
+        category: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE
+    ) -> Dict:
+        """
+        Return one page in (created_at, id) descending order.
+
+        Cursors are interchangeable with those from utils.pagination.paginate.
+        """
+        view = self._views.get(category or ALL_CATEGORIES, [])
+        keys = self._keys.get(category or ALL_CATEGORIES, [])
+
+        end = len(view)
+        if cursor:
+            end = bisect_left(keys, decode_cursor(cursor, datetime))
+
+        start = max(0, end - limit)
+        items = view[start:end][::-1]
+
+        next_cursor = None
+        if start > 0:
+            last = items[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+        return {"items": items, "next_cursor": next_cursor}
+
+
+class CatalogCache:
+    """
+    Process-wide catalog snapshot, rebuilt from the DB when stale.
+
+    Admin writes in this process invalidate it immediately; the TTL bounds
+    how long other worker processes can serve a catalog that changed
+    elsewhere.
+    """
+
+    def __init__(self, ttl_seconds: float = settings.CATALOG_CACHE_TTL_SECONDS):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: Maximum age of a snapshot before it is rebuilt
+        """
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def get(self, db: Session) -> CatalogSnapshot:
+        """Return the current snapshot, building it if missing or expired."""
+        snapshot = self._snapshot
+        if snapshot is not None and not self._expired(snapshot):
+            return snapshot
+
+        # One thread rebuilds; the others wait for its snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or self._expired(snapshot):
+                products = db.query(Product).all()
+                snapshot = CatalogSnapshot([ProductResponse.model_validate(p) for p in products])
+                self.builds += 1
+                self._snapshot = snapshot
+            return snapshot
+
+    def invalidate(self):
+        """Drop the snapshot so the next read sees the latest catalog."""
+        # Waits for a build in progress, which may have missed the write,
+        # so the snapshot it installs is dropped here rather than served
+        with self._lock:
+            self._snapshot = None
+
+    def _expired(self, snapshot: CatalogSnapshot) -> bool:
+        return time.monotonic() - snapshot.built_at > self.ttl_seconds
+
+
+catalog_cache = CatalogCache()
@@ -0,0 +1,90 @@
+import asyncio
+import json
+import typing
+from typing import Any, AsyncIterator, List
+
+from pydantic import BaseModel
+
+
+def sample_for(annotation) -> Any:
+    """Build a placeholder value matching a pydantic field annotation."""
+    origin = typing.get_origin(annotation)
+    if origin in (list, List):
+        return [sample_for(typing.get_args(annotation)[0])]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return {name: sample_for(field.annotation) for name, field in annotation.model_fields.items()}
+    if annotation is int:
+        return 1
+    if annotation is float:
+        return 1.0
+    if annotation is bool:
+        return True
+    return "sample"
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+STREAM_CHUNKS = 20
+
+
+class FakeModels:
+    def __init__(self, latency_seconds: float):
+        self.latency_seconds = latency_seconds
+        self.calls = 0
+
+    def _text(self, config) -> str:
+        schema = getattr(config, "response_schema", None)
+        if schema is None:
+            return "sample"
+        return json.dumps(sample_for(schema), indent=2)
+
+    async def generate_content(self, model: str, contents, config=None) -> FakeResponse:
+        self.calls += 1
+        await asyncio.sleep(self.latency_seconds)
+        return FakeResponse(self._text(config))
+
+    async def generate_content_stream(self, model: str, contents, config=None) -> AsyncIterator[FakeResponse]:
+        self.calls += 1
+        text = self._text(config)
+        size = -(-len(text) // STREAM_CHUNKS)
+
+        async def chunks():
+            # The latency is spread over the chunks, like tokens arriving
+            for start in range(0, len(text), size):
+                await asyncio.sleep(self.latency_seconds / STREAM_CHUNKS)
+                yield FakeResponse(text[start:start + size])
+
+        return chunks()
+
+
+class FakeAio:
+    def __init__(self, models: FakeModels):
+        self.models = models
+
+
+class FakeGeminiClient:
+    """
+    Local stand-in for genai.Client.
+
+    Answers `client.aio.models.generate_content` (and its streaming
+    variant) with placeholder JSON matching the requested response schema,
+    so the AI endpoints can be exercised without an API key or network
+    access. Select it with GEMINI_CLIENT=fake.
+    """
+
+    def __init__(self, latency_seconds: float = 0.0):
+        """
+        Initialize the client.
+
+        Args:
+            latency_seconds: Simulated model latency per call
+        """
+        self.aio = FakeAio(FakeModels(latency_seconds))
+
+    @property
+    def calls(self) -> int:
+        """Number of model calls made so far, streamed or not."""
+        return self.aio.models.calls
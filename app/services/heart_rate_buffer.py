@@ -0,0 +1,155 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from core.config import settings
+from core.database import run_db
+from models.health import Anomaly, HeartRate
+from services.anomaly_service import anomaly_row, save_anomalies
+from services.heart_rate_ingest import insert_samples
+
+
+class HeartRateWriteBuffer:
+    """
+    Shared write-behind queue for heart rate samples.
+
+    Samples (and anomalies detected on them) from every open WebSocket are
+    queued here and written to the database with bulk inserts once either
+    the batch size or the flush interval is reached.
+    """
+
+    def __init__(
+        self,
+        max_size: int = settings.HEART_RATE_BUFFER_MAX_SIZE,
+        batch_size: int = settings.HEART_RATE_FLUSH_BATCH_SIZE,
+        flush_interval: float = settings.HEART_RATE_FLUSH_INTERVAL_SECONDS
+    ):
+        """
+        Initialize the write buffer.
+
+        Args:
+            max_size: Maximum number of queued samples before producers wait
+            batch_size: Number of samples that triggers an immediate flush
+            flush_interval: Maximum seconds a sample waits before being flushed
+        """
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.rows_flushed = 0
+        self.flush_count = 0
+        self.failed_flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    async def start(self):
+        """Start the background flush task."""
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush task and write out everything still queued."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def put(self, user_id: int, bpm: int, timestamp: datetime):
+        """
+        Queue a heart rate sample for writing.
+
+        Waits while the queue is full, so producers slow down instead of
+        growing memory without bound.
+        """
+        if self._queue is None:
+            raise RuntimeError("Heart rate buffer is not running")
+        await self._queue.put((HeartRate, {"user_id": user_id, "bpm": bpm, "timestamp": timestamp}))
+
+    async def put_anomaly(self, user_id: int, anomaly: Dict):
+        """Queue a detected anomaly for writing with the next batch."""
+        if self._queue is None:
+            raise RuntimeError("Heart rate buffer is not running")
+        await self._queue.put((Anomaly, anomaly_row(user_id, anomaly)))
+
+    def metrics(self) -> Dict:
+        """Return queue depth and flush statistics."""
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_capacity": self.max_size,
+            "rows_flushed": self.rows_flushed,
+            "flushes": self.flush_count,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "avg_flush_ms": round(self._total_flush_ms / self.flush_count, 2) if self.flush_count else 0.0,
+            "max_flush_ms": round(self.max_flush_ms, 2)
+        }
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        batch: List[Tuple] = []
+        try:
+            while True:
+                batch.append(await self._queue.get())
+                deadline = loop.time() + self.flush_interval
+
+                while len(batch) < self.batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                pending, batch = batch, []
+                await self._flush(pending)
+        except asyncio.CancelledError:
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            for i in range(0, len(batch), self.batch_size):
+                await self._flush(batch[i:i + self.batch_size])
+            raise
+
+    async def _flush(self, batch: List[Tuple]):
+        started = time.perf_counter()
+        try:
+            # Shielded so a shutdown mid-flush lets the write finish
+            await asyncio.shield(run_db(lambda db: self._write(db, batch)))
+            self.rows_flushed += len(batch)
+        except Exception as e:
+            print(f"Heart rate flush error: {e}")
+            self.failed_flushes += 1
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.flush_count += 1
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+
+    @staticmethod
+    def _write(db, batch: List[Tuple]):
+        samples = [row for model, row in batch if model is HeartRate]
+        anomalies = [row for model, row in batch if model is Anomaly]
+        try:
+            if samples:
+                insert_samples(db, samples)
+            if anomalies:
+                save_anomalies(db, anomalies)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+
+heart_rate_buffer = HeartRateWriteBuffer()
@@ -0,0 +1,173 @@
+import asyncio
+import json
+from datetime import datetime
+from typing import Dict, Set
+
+from core.config import settings
+from core.database import run_db
+from services.anomaly_monitor import anomaly_monitor
+from services.broadcast import BroadcastBackend, create_broadcast_backend
+from services.heart_rate_buffer import heart_rate_buffer
+from services.heart_rate_service import HeartRateSimulator
+
+ACTIVITY_CYCLE = ["resting", "walking", "jogging", "running", "cooldown", "resting"]
+
+
+class Subscriber:
+    """A single viewer of a user's heart rate stream."""
+
+    def __init__(self, max_queue: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def offer(self, frame: str):
+        """
+        Queue a frame without waiting.
+
+        A slow consumer whose queue is full loses its oldest frame, so it
+        always catches up to live data and never holds back the producer.
+        """
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(frame)
+
+
+class HeartRateHub:
+    """
+    Per-user broadcast hub for live heart rate frames.
+
+    One producer task per user generates, persists and scores each sample
+    once, then publishes the serialized frame through the broadcast backend,
+    which fans it out to subscribers in every worker process.
+    """
+
+    def __init__(
+        self,
+        backend: BroadcastBackend = None,
+        max_queue: int = settings.HEART_RATE_SUBSCRIBER_QUEUE_SIZE
+    ):
+        """
+        Initialize the hub.
+
+        Args:
+            backend: Broadcast transport; defaults to the configured backend
+            max_queue: Frames buffered per subscriber before old ones are dropped
+        """
+        self.backend = backend or create_broadcast_backend()
+        self.max_queue = max_queue
+        self._subscribers: Dict[int, Set[Subscriber]] = {}
+        self._producers: Dict[int, asyncio.Task] = {}
+        self.frames_published = 0
+        self._dropped_closed = 0
+
+    def subscribe(self, user_id: int) -> Subscriber:
+        """Add a subscriber, starting the user's producer if needed."""
+        subscriber = Subscriber(self.max_queue)
+        self._subscribers.setdefault(user_id, set()).add(subscriber)
+
+        if user_id not in self._producers:
+            self._producers[user_id] = asyncio.create_task(self._produce(user_id))
+
+        return subscriber
+
+    def unsubscribe(self, user_id: int, subscriber: Subscriber):
+        """Remove a subscriber, stopping the producer once nobody is watching."""
+        subscribers = self._subscribers.get(user_id)
+        if not subscribers or subscriber not in subscribers:
+            return
+
+        subscribers.discard(subscriber)
+        self._dropped_closed += subscriber.dropped
+
+        if not subscribers:
+            del self._subscribers[user_id]
+            producer = self._producers.pop(user_id, None)
+            if producer:
+                producer.cancel()
+
+    async def publish(self, user_id: int, frame: Dict):
+        """Serialize a frame once and broadcast it to the user's subscribers."""
+        await self.backend.publish(user_id, json.dumps(frame))
+        self.frames_published += 1
+
+    def deliver(self, user_id: int, message: str):
+        """Offer a broadcast frame to this process's subscribers of the user."""
+        for subscriber in self._subscribers.get(user_id, ()):
+            subscriber.offer(message)
+
+    def metrics(self) -> Dict:
+        """Return stream, subscriber and dropped-frame counts."""
+        subscribers = [s for subs in self._subscribers.values() for s in subs]
+        return {
+            "streams": len(self._producers),
+            "subscribers": len(subscribers),
+            "frames_published": self.frames_published,
+            "frames_dropped": self._dropped_closed + sum(s.dropped for s in subscribers)
+        }
+
+    async def start(self):
+        """Attach to the broadcast backend."""
+        await self.backend.start(self.deliver)
+
+    async def stop(self):
+        """Cancel every producer task and detach from the backend."""
+        producers = list(self._producers.values())
+        self._producers.clear()
+        self._subscribers.clear()
+        for producer in producers:
+            producer.cancel()
+        await asyncio.gather(*producers, return_exceptions=True)
+        await self.backend.stop()
+
+    async def _produce(self, user_id: int):
+        # Another worker may already produce this user's stream; its frames
+        # reach our subscribers through the backend until we take over
+        while not self.backend.try_acquire_producer(user_id):
+            await asyncio.sleep(1)
+
+        try:
+            await self._generate(user_id)
+        finally:
+            self.backend.release_producer(user_id)
+
+    async def _generate(self, user_id: int):
+        # Score the stream against the user's stored history, not from scratch
+        await run_db(lambda db: anomaly_monitor.ensure_warm(db, user_id))
+
+        simulator = HeartRateSimulator(activity_level="resting")
+        activity_index = 0
+        messages_sent = 0
+
+        while True:
+            if messages_sent > 0 and messages_sent % 30 == 0:
+                activity_index = min(activity_index + 1, len(ACTIVITY_CYCLE) - 1)
+                simulator.transition_activity(ACTIVITY_CYCLE[activity_index])
+
+            bpm = simulator.get_next_value()
+            timestamp = datetime.now()
+
+            # Queued for a bulk insert instead of committing every sample
+            await heart_rate_buffer.put(user_id, bpm, timestamp)
+            anomaly = anomaly_monitor.observe(user_id, bpm, timestamp)
+
+            await self.publish(user_id, {
+                "bpm": bpm,
+                "timestamp": timestamp.isoformat(),
+                "activity": simulator.activity_level,
+                "user_id": user_id
+            })
+
+            if anomaly:
+                await heart_rate_buffer.put_anomaly(user_id, anomaly)
+                await self.publish(user_id, {
+                    "type": "anomaly",
+                    "user_id": user_id,
+                    **anomaly
+                })
+
+            messages_sent += 1
+            await asyncio.sleep(1)
+
+
+heart_rate_hub = HeartRateHub()
@@ -0,0 +1,98 @@
+from array import array
+from datetime import datetime
+from typing import Dict, List
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.database import dialect_insert
+from models.health import HeartRate
+from services.anomaly_monitor import anomaly_monitor
+from services.anomaly_service import anomaly_row, save_anomalies
+from services.heart_rate_rollup import update_rollups
+
+MIN_BPM = 20
+MAX_BPM = 250
+MAX_BATCH_SAMPLES = settings.HEART_RATE_MAX_BATCH_SAMPLES
+# Upper bound on a JSON batch body: a sample such as
+# ["2026-01-01T00:00:00.000000+00:00", 120] with room for whitespace
+MAX_JSON_SAMPLE_BYTES = 96
+
+
+def naive_local(timestamp: datetime) -> datetime:
+    """Convert a client timestamp to the naive local time stored in the DB."""
+    if timestamp.tzinfo is not None:
+        return timestamp.astimezone().replace(tzinfo=None)
+    return timestamp
+
+
+def insert_samples(db: Session, rows: List[Dict]) -> List[Dict]:
+    """
+    Insert heart rate rows, skipping any (user_id, timestamp) already stored.
+
+    Only the rows actually inserted are merged into the rollups, so retried
+    uploads are idempotent and late arrivals land in their own time bucket.
+    The caller owns the transaction; nothing is committed here.
+
+    Returns:
+        The inserted rows with their new ids
+    """
+    if not rows:
+        return []
+
+    stmt = dialect_insert(HeartRate)\
+        .on_conflict_do_nothing(index_elements=["user_id", "timestamp"])\
+        .returning(HeartRate.id, HeartRate.user_id, HeartRate.bpm, HeartRate.timestamp)
+
+    inserted = [dict(r._mapping) for r in db.execute(stmt, rows)]
+    update_rollups(db, inserted)
+    return inserted
+
+
+def score_samples(db: Session, rows: List[Dict]):
+    """Feed newly inserted samples through the online detector, oldest first."""
+    first_ids: Dict[int, int] = {}
+    for row in rows:
+        first_ids[row["user_id"]] = min(row["id"], first_ids.get(row["user_id"], row["id"]))
+    for user_id, first_id in first_ids.items():
+        anomaly_monitor.ensure_warm(db, user_id, before_id=first_id)
+
+    detected = []
+    for row in sorted(rows, key=lambda r: r["timestamp"]):
+        anomaly = anomaly_monitor.observe(row["user_id"], row["bpm"], row["timestamp"])
+        if anomaly:
+            detected.append(anomaly_row(row["user_id"], anomaly))
+    save_anomalies(db, detected)
+
+
+def ingest_samples(db: Session, user_id: int, timestamps: List[datetime], bpm_values: array) -> Dict:
+    """
+    Validate and bulk insert a batch of heart rate samples.
+
+    The whole batch is checked up front (size, length match, BPM range over
+    the packed array) and then written in one transaction. Samples already
+    stored are skipped.
+
+    Returns:
+        Counts of inserted and duplicate samples
+    """
+    if len(timestamps) != len(bpm_values):
+        raise HTTPException(status_code=422, detail="timestamps and bpm values differ in length")
+    if not bpm_values:
+        return {"inserted": 0, "duplicates": 0}
+    if len(bpm_values) > MAX_BATCH_SAMPLES:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_SAMPLES} samples per batch")
+    if min(bpm_values) < MIN_BPM or max(bpm_values) > MAX_BPM:
+        raise HTTPException(status_code=422, detail=f"bpm values must be between {MIN_BPM} and {MAX_BPM}")
+
+    rows = [
+        {"user_id": user_id, "bpm": bpm, "timestamp": naive_local(ts)}
+        for ts, bpm in zip(timestamps, bpm_values)
+    ]
+
+    inserted = insert_samples(db, rows)
+    score_samples(db, inserted)
+    db.commit()
+
+    return {"inserted": len(inserted), "duplicates": len(rows) - len(inserted)}
@@ -0,0 +1,166 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from core.database import dialect_insert, engine
+from models.health import HeartRate, HeartRateRollup
+
+RESOLUTIONS = ("1m", "1h", "1d")
+
+BACKFILL_CHUNK_SIZE = 10000
+
+
+def bucket_start(timestamp: datetime, resolution: str) -> datetime:
+    """Truncate a timestamp to the start of its rollup bucket."""
+    if resolution == "1m":
+        return timestamp.replace(second=0, microsecond=0)
+    if resolution == "1h":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    if resolution == "1d":
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown resolution: {resolution}")
+
+
+def aggregate_samples(samples: Iterable[Dict]) -> List[Dict]:
+    """
+    Aggregate raw samples into rollup rows for every resolution.
+
+    Args:
+        samples: Heart rate readings with 'user_id', 'bpm' and 'timestamp' keys
+
+    Returns:
+        One row per (user, resolution, bucket) with min/max/sum/count
+    """
+    buckets: Dict[tuple, Dict] = {}
+
+    for sample in samples:
+        bpm = sample["bpm"]
+        for resolution in RESOLUTIONS:
+            key = (sample["user_id"], resolution, bucket_start(sample["timestamp"], resolution))
+            row = buckets.get(key)
+            if row is None:
+                buckets[key] = {
+                    "user_id": key[0],
+                    "resolution": resolution,
+                    "bucket_start": key[2],
+                    "min_bpm": bpm,
+                    "max_bpm": bpm,
+                    "sum_bpm": bpm,
+                    "count": 1
+                }
+            else:
+                row["min_bpm"] = min(row["min_bpm"], bpm)
+                row["max_bpm"] = max(row["max_bpm"], bpm)
+                row["sum_bpm"] += bpm
+                row["count"] += 1
+
+    return list(buckets.values())
+
+
+def update_rollups(db: Session, samples: Iterable[Dict]):
+    """
+    Merge new samples into the rollup tables with a single upsert.
+
+    The caller owns the transaction; nothing is committed here.
+    """
+    rows = aggregate_samples(samples)
+    if not rows:
+        return
+
+    # Scalar two-argument min/max in SQLite, LEAST/GREATEST in Postgres
+    if engine.dialect.name == "postgresql":
+        lower, upper = func.least, func.greatest
+    else:
+        lower, upper = func.min, func.max
+
+    stmt = dialect_insert(HeartRateRollup)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "resolution", "bucket_start"],
+        set_={
+            "min_bpm": lower(HeartRateRollup.min_bpm, stmt.excluded.min_bpm),
+            "max_bpm": upper(HeartRateRollup.max_bpm, stmt.excluded.max_bpm),
+            "sum_bpm": HeartRateRollup.sum_bpm + stmt.excluded.sum_bpm,
+            "count": HeartRateRollup.count + stmt.excluded.count
+        }
+    )
+    db.execute(stmt, rows)
+
+
+def backfill_rollups(db: Session) -> int:
+    """
+    Build rollups for every stored reading, chunk by chunk.
+
+    Meant for a rollup table that was just created next to existing
+    readings; running it on populated rollups would count samples twice.
+
+    Returns:
+        Number of readings rolled up
+    """
+    total = 0
+    last_id = 0
+    while True:
+        chunk = db.query(HeartRate.id, HeartRate.user_id, HeartRate.bpm, HeartRate.timestamp)\
+            .filter(HeartRate.id > last_id)\
+            .order_by(HeartRate.id)\
+            .limit(BACKFILL_CHUNK_SIZE)\
+            .all()
+        if not chunk:
+            break
+
+        update_rollups(db, (
+            {"user_id": r.user_id, "bpm": r.bpm, "timestamp": r.timestamp}
+            for r in chunk if r.timestamp is not None
+        ))
+        db.commit()
+        total += len(chunk)
+        last_id = chunk[-1].id
+
+    if total:
+        print(f"✓ Backfilled heart rate rollups from {total} readings")
+    return total
+
+
+def rollup_query(
+    db: Session,
+    user_id: int,
+    resolution: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+):
+    """Query rollup rows for a user in a time range, newest first."""
+    query = db.query(HeartRateRollup)\
+        .filter(HeartRateRollup.user_id == user_id)\
+        .filter(HeartRateRollup.resolution == resolution)
+
+    if start:
+        query = query.filter(HeartRateRollup.bucket_start >= bucket_start(start, resolution))
+    if end:
+        query = query.filter(HeartRateRollup.bucket_start <= end)
+
+    return query.order_by(HeartRateRollup.bucket_start.desc())
+
+
+def rollup_point(row: HeartRateRollup) -> Dict:
+    """Convert a rollup row into a chart point."""
+    return {
+        "timestamp": row.bucket_start,
+        "min_bpm": row.min_bpm,
+        "max_bpm": row.max_bpm,
+        "mean_bpm": round(row.sum_bpm / row.count, 2),
+        "count": row.count
+    }
+
+
+def get_rollups(
+    db: Session,
+    user_id: int,
+    resolution: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = 100
+) -> List[Dict]:
+    """Read rollup points for a user, newest first."""
+    rows = rollup_query(db, user_id, resolution, start, end).limit(limit).all()
+    return [rollup_point(r) for r in rows]
@@ -1,5 +1,16 @@
 import random
 import math
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Tuple
+
+# Activity phases of a simulated one-hour session: (activity, seconds)
+SIMULATION_PHASES: List[Tuple[str, int]] = [
+    ("resting", 600),
+    ("walking", 900),
+    ("jogging", 1200),
+    ("cooldown", 600),
+    ("resting", 300)
+]
 
 
 class HeartRateSimulator:
@@ -69,4 +80,28 @@ class HeartRateSimulator:
         new_base = self._calculate_base_hr()
         
         # Smooth transition by averaging with current rate
-        self.base_hr = int((self.base_hr + new_base) / 2)
\ No newline at end of file
+        self.base_hr = int((self.base_hr + new_base) / 2)
+
+
+def simulate_history(phases: List[Tuple[str, int]] = SIMULATION_PHASES) -> Iterator[Dict]:
+    """
+    Lazily generate one simulated reading per second across activity phases.
+    
+    Args:
+        phases: List of (activity, duration in seconds)
+        
+    Yields:
+        Readings with 'timestamp', 'bpm' and 'activity' keys
+    """
+    simulator = HeartRateSimulator()
+    current_time = datetime.now()
+    
+    for activity, duration in phases:
+        simulator.transition_activity(activity)
+        for _ in range(duration):
+            yield {
+                "timestamp": current_time.isoformat(),
+                "bpm": simulator.get_next_value(),
+                "activity": activity
+            }
+            current_time = current_time + timedelta(seconds=1)
@@ -0,0 +1,189 @@
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from core.database import Session as SessionLocal, db_executor, dialect_insert
+from models.product import Product, ProductTag
+from services.catalog_cache import CatalogSnapshot, catalog_cache
+
+TOP_N = 5
+DEFAULT_BMI = 22
+
+# Tag -> (product field, keyword) it is extracted from
+TAG_RULES = {
+    "protein": ("name", "protein"),
+    "low-calorie": ("description", "low-calorie"),
+}
+
+BMI_BANDS = ("underweight", "normal", "overweight")
+GOALS = ("muscle", "general")
+
+# (BMI band or None for any, goal or None for any, required tag, reason), first match wins
+RECOMMENDATION_RULES = [
+    ("underweight", None, "protein", "Recommended for weight gain"),
+    ("overweight", None, "low-calorie", "Recommended for weight management"),
+    (None, "muscle", "protein", "Supports muscle building goals"),
+]
+
+Segment = Tuple[str, str]
+
+
+def extract_tags(product) -> Set[str]:
+    """Derive a product's tags from its name, description and category."""
+    tags = {f"category:{product.category.lower()}"}
+    for tag, (field, keyword) in TAG_RULES.items():
+        if keyword in (getattr(product, field) or "").lower():
+            tags.add(tag)
+    return tags
+
+
+def save_product_tags(db: Session, product):
+    """Store a new product's tags; the caller commits."""
+    db.add_all(ProductTag(product_id=product.id, tag=tag) for tag in extract_tags(product))
+
+
+def backfill_product_tags():
+    """
+    Tag products stored without going through the API (e.g. seed data).
+
+    Runs at startup. Rows another worker inserted first are skipped, so
+    workers starting together do not conflict.
+    """
+    db = SessionLocal()
+    try:
+        untagged = db.query(Product)\
+            .outerjoin(ProductTag, ProductTag.product_id == Product.id)\
+            .filter(ProductTag.product_id.is_(None))\
+            .all()
+        rows = [{"product_id": p.id, "tag": tag} for p in untagged for tag in extract_tags(p)]
+        if rows:
+            stmt = dialect_insert(ProductTag).on_conflict_do_nothing(index_elements=["product_id", "tag"])
+            db.execute(stmt, rows)
+            db.commit()
+    finally:
+        db.close()
+
+
+def delete_product_tags(db: Session, product_id: int):
+    """Remove a product's tags; the caller commits."""
+    db.query(ProductTag).filter(ProductTag.product_id == product_id).delete()
+
+
+def user_segment(height_cm: Optional[float], weight_kg: Optional[float], goals: Optional[str]) -> Segment:
+    """Bucket a user by BMI band and goal."""
+    bmi = weight_kg / ((height_cm / 100) ** 2) if height_cm and weight_kg else DEFAULT_BMI
+
+    if bmi < 18.5:
+        band = "underweight"
+    elif bmi < 25:
+        band = "normal"
+    else:
+        band = "overweight"
+
+    goal = "muscle" if goals and "muscle" in goals.lower() else "general"
+    return band, goal
+
+
+class RecommendationEngine:
+    """
+    Per-segment top-N product recommendations, precomputed from the tag index.
+
+    Lists are rebuilt in the background whenever the catalog changes and
+    swapped in whole, so a lookup is a single dict access.
+    """
+
+    def __init__(self, top_n: int = TOP_N):
+        """
+        Initialize the engine.
+
+        Args:
+            top_n: Number of products kept per segment
+        """
+        self.top_n = top_n
+        self._lists: Dict[Segment, List[Dict]] = {}
+        self._catalog_etag: Optional[str] = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def recommend(self, db: Session, segment: Segment) -> List[Dict]:
+        """Return the precomputed recommendations for a segment."""
+        snapshot = catalog_cache.get(db)
+
+        if self._catalog_etag is None:
+            # Nothing to serve yet: build inline once
+            self.refresh(db, snapshot)
+        elif snapshot.etag != self._catalog_etag:
+            # Serve the previous lists while new ones are built
+            self._schedule_refresh()
+
+        return self._lists.get(segment, [])
+
+    def refresh(self, db: Session, snapshot: CatalogSnapshot):
+        """Rebuild every segment's list from a catalog snapshot."""
+        with self._build_lock:
+            if snapshot.etag == self._catalog_etag:
+                return
+            self._rebuild(db, snapshot)
+
+    def _rebuild(self, db: Session, snapshot: CatalogSnapshot):
+        tags: Dict[int, Set[str]] = {}
+        for product_id, tag in db.query(ProductTag.product_id, ProductTag.tag):
+            tags.setdefault(product_id, set()).add(tag)
+
+        # Products written since startup without going through the API are
+        # tagged in memory; reads never write
+        for product in snapshot.by_id.values():
+            if product.id not in tags:
+                tags[product.id] = extract_tags(product)
+
+        products = sorted(snapshot.by_id.values(), key=lambda p: p.id)
+        lists = {}
+        for band in BMI_BANDS:
+            for goal in GOALS:
+                lists[(band, goal)] = self._top_products(band, goal, products, tags)
+
+        self._lists = lists
+        self._catalog_etag = snapshot.etag
+
+    def _top_products(self, band: str, goal: str, products: List, tags: Dict[int, Set[str]]) -> List[Dict]:
+        rules = [
+            (tag, reason) for rule_band, rule_goal, tag, reason in RECOMMENDATION_RULES
+            if rule_band in (None, band) and rule_goal in (None, goal)
+        ]
+
+        recommended = []
+        for product in products:
+            product_tags = tags.get(product.id, set())
+            reason = next((reason for tag, reason in rules if tag in product_tags), None)
+            if reason:
+                recommended.append({**product.model_dump(), "recommendation_reason": reason})
+                if len(recommended) >= self.top_n:
+                    break
+        return recommended
+
+    def _schedule_refresh(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        try:
+            db_executor.submit(self._background_refresh)
+        except RuntimeError:
+            # Executor already shut down
+            self._refreshing = False
+
+    def _background_refresh(self):
+        db = SessionLocal()
+        try:
+            self.refresh(db, catalog_cache.get(db))
+        except Exception as e:
+            print(f"Error refreshing recommendations: {e}")
+            db.rollback()
+        finally:
+            db.close()
+            self._refreshing = False
+
+
+recommendation_engine = RecommendationEngine()
@@ -0,0 +1,183 @@
+import re
+from typing import Dict, List, Optional
+
+from sqlalchemy import Float, Integer, and_, or_, text
+from sqlalchemy.orm import Query
+
+from core.database import engine
+from utils.pagination import encode_cursor, decode_cursor, DEFAULT_PAGE_SIZE
+
+# Searchable tables and their text columns, most important first. Earlier
+# columns get a higher weight when ranking.
+SEARCH_INDEXES = {
+    "product": ("name", "description"),
+    "blog": ("title", "content"),
+}
+
+# Relative weights for the first and remaining columns
+PRIMARY_WEIGHT = 10.0
+SECONDARY_WEIGHT = 1.0
+
+# Words are indexed unstemmed. Search terms are prefixes typed so far, and
+# a stemmed index misses prefixes that run past the stem ("runn" would
+# not find "running", stored as "run").
+SQLITE_TOKENIZER = "unicode61 remove_diacritics 2"
+POSTGRES_CONFIG = "simple"
+
+
+def init_search():
+    """
+    Create the full-text indexes for the active dialect.
+
+    SQLite gets an external-content FTS5 table per searchable table, kept in
+    sync by insert/update/delete triggers. Postgres gets a GIN index on a
+    weighted tsvector expression, which is always current.
+    """
+    if engine.dialect.name == "postgresql":
+        _init_postgres()
+    else:
+        _init_sqlite()
+
+
+def _init_sqlite():
+    with engine.begin() as conn:
+        for table, columns in SEARCH_INDEXES.items():
+            fts = f"{table}_fts"
+            cols = ", ".join(columns)
+            new_cols = ", ".join(f"new.{c}" for c in columns)
+            old_cols = ", ".join(f"old.{c}" for c in columns)
+
+            existing = conn.execute(
+                text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": fts}
+            ).first()
+
+            # Indexes built with an older tokenizer are rebuilt from scratch;
+            # the triggers refer to the table by name and keep working
+            exists = existing is not None and SQLITE_TOKENIZER in existing.sql
+            if existing is not None and not exists:
+                conn.execute(text(f"DROP TABLE {fts}"))
+
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                f"{cols}, content='{table}', content_rowid='id', "
+                f"tokenize='{SQLITE_TOKENIZER}', prefix='2 3')"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+                f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+            ))
+
+            # Index rows written before search existed
+            if not exists:
+                conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+def _tsvector(table: str) -> str:
+    # Must match the indexed expression exactly for the GIN index to be used
+    weighted = [
+        f"setweight(to_tsvector('{POSTGRES_CONFIG}', coalesce({column}, '')), '{'A' if i == 0 else 'B'}')"
+        for i, column in enumerate(SEARCH_INDEXES[table])
+    ]
+    return " || ".join(weighted)
+
+
+def _init_postgres():
+    with engine.begin() as conn:
+        for table in SEARCH_INDEXES:
+            # Replaces the earlier stemmed ('english') index
+            conn.execute(text(f"DROP INDEX IF EXISTS ix_{table}_search"))
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_search_{POSTGRES_CONFIG} ON {table} "
+                f"USING GIN (({_tsvector(table)}))"
+            ))
+
+
+def search_terms(search: str) -> List[str]:
+    """Split user input into lowercase word terms, dropping query syntax."""
+    return re.findall(r"\w+", search.lower())
+
+
+def _ranked_ids(table: str, terms: List[str]):
+    """Subquery of (id, score) for rows matching every term as a prefix; higher score is better."""
+    if engine.dialect.name == "postgresql":
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        vector = _tsvector(table)
+        sql = text(
+            f"SELECT id, ts_rank({vector}, to_tsquery('{POSTGRES_CONFIG}', :q), 1) AS score FROM {table} "
+            f"WHERE {vector} @@ to_tsquery('{POSTGRES_CONFIG}', :q)"
+        )
+    else:
+        fts = f"{table}_fts"
+        tsquery = " ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(
+            str(PRIMARY_WEIGHT if i == 0 else SECONDARY_WEIGHT)
+            for i in range(len(SEARCH_INDEXES[table]))
+        )
+        # bm25 is lower for better matches
+        sql = text(
+            f"SELECT rowid AS id, -bm25({fts}, {weights}) AS score FROM {fts} "
+            f"WHERE {fts} MATCH :q"
+        )
+
+    return sql.bindparams(q=tsquery).columns(id=Integer, score=Float).subquery()
+
+
+def search_page(
+    query: Query,
+    model,
+    search: str,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE
+) -> Dict:
+    """
+    Rank the rows of a query by full-text relevance to the search string.
+
+    Every word must match, as a whole word or a prefix; matches in the first
+    indexed column (name, title) rank higher. Pages are keyset-paginated on
+    (score, id) like every other list, so no page skips over the rows of
+    the ones before it. Scores depend on the whole table, so a page read
+    after the catalog changed may repeat or miss a row near its boundary.
+
+    Returns:
+        Dict with 'items' and 'next_cursor' (None on the last page)
+    """
+    terms = search_terms(search)
+    if not terms:
+        return {"items": [], "next_cursor": None}
+
+    ranked = _ranked_ids(model.__tablename__, terms)
+    query = query\
+        .join(ranked, ranked.c.id == model.id)\
+        .add_columns(ranked.c.score)
+
+    if cursor:
+        score, row_id = decode_cursor(cursor, float)
+        query = query.filter(
+            or_(
+                ranked.c.score < score,
+                and_(ranked.c.score == score, model.id < row_id)
+            )
+        )
+
+    rows = query\
+        .order_by(ranked.c.score.desc(), model.id.desc())\
+        .limit(limit + 1)\
+        .all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last, score = rows[-1]
+        next_cursor = encode_cursor(score, last.id)
+
+    return {"items": [item for item, _ in rows], "next_cursor": next_cursor}
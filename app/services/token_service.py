@@ -0,0 +1,51 @@
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from core.security import create_token_pair
+from models.user import RefreshToken, User
+
+
+def issue_token_pair(db: Session, user: User) -> Dict:
+    """
+    Create a token pair for a user and record its refresh token as unused.
+
+    Commits the session, together with anything the caller did before.
+    """
+    pair, refresh_claims = create_token_pair(user)
+
+    # Drop the user's expired refresh tokens while we are here
+    db.execute(
+        delete(RefreshToken)
+        .where(RefreshToken.user_id == user.id)
+        .where(RefreshToken.expires_at <= int(time.time()))
+    )
+    db.add(RefreshToken(
+        jti=refresh_claims["jti"],
+        user_id=user.id,
+        expires_at=refresh_claims["exp"]
+    ))
+    db.commit()
+    return pair
+
+
+def consume_refresh_token(db: Session, jti: str) -> Optional[int]:
+    """
+    Mark a refresh token as used.
+
+    The row is deleted and returned in one statement, so of two requests
+    presenting the same token only one gets a user id back. The caller
+    owns the transaction; nothing is committed here.
+
+    Returns:
+        The token's user id, or None if it was already used or has expired
+    """
+    row = db.execute(
+        delete(RefreshToken)
+        .where(RefreshToken.jti == jti)
+        .where(RefreshToken.expires_at > int(time.time()))
+        .returning(RefreshToken.user_id)
+    ).first()
+    return row.user_id if row else None
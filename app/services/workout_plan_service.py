@@ -0,0 +1,176 @@
+import asyncio
+import hashlib
+import json
+from contextlib import aclosing
+from datetime import datetime
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from core.database import dialect_insert, run_db
+from models.health import StoredWorkoutPlan
+from services.ai_gateway import CircuitOpenError
+from services.ai_service import (
+    WORKOUT_PLAN_ERROR_FALLBACK, WORKOUT_PLAN_FALLBACK,
+    gemini_client, generate_workout_plan, stream_workout_plan, workout_plan_inputs
+)
+
+# Bump when the prompt or schema changes so every stored plan is regenerated
+PLAN_VERSION = "v1"
+
+
+def inputs_fingerprint(inputs: Dict) -> str:
+    """Stable hash of the prompt inputs."""
+    payload = json.dumps(inputs, sort_keys=True)
+    return hashlib.sha256(f"{PLAN_VERSION}:{payload}".encode()).hexdigest()
+
+
+def _load_plan(db: Session, user_id: int) -> Optional[Tuple[str, str]]:
+    row = db.query(StoredWorkoutPlan.fingerprint, StoredWorkoutPlan.plan)\
+        .filter(StoredWorkoutPlan.user_id == user_id)\
+        .first()
+    return tuple(row) if row else None
+
+
+def _save_plan(db: Session, user_id: int, fingerprint: str, plan: Dict):
+    values = {
+        "user_id": user_id,
+        "fingerprint": fingerprint,
+        "plan": json.dumps(plan),
+        "generated_at": datetime.now()
+    }
+    stmt = dialect_insert(StoredWorkoutPlan).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={k: stmt.excluded[k] for k in ("fingerprint", "plan", "generated_at")}
+    )
+    db.execute(stmt)
+    db.commit()
+
+
+class WorkoutPlanService:
+    """
+    Stored per-user workout plans, regenerated in the background.
+
+    Each plan is stored with a fingerprint of the prompt inputs. A request
+    whose inputs still match gets the stored plan straight from the DB; one
+    whose inputs changed gets the previous plan while a new one is
+    generated. The request never waits on the model.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[int, asyncio.Task] = {}
+        # Fingerprint whose last generation failed, per user
+        self._failed: Dict[int, str] = {}
+
+    async def get_plan(self, user) -> Tuple[str, Optional[Dict]]:
+        """
+        Return the user's plan and its status.
+
+        Status is "ready" (matches current inputs), "stale" (a newer plan
+        is being generated), "generating" (no plan yet; plan is None),
+        "error" (generation failed; plan is the error fallback) or
+        "unavailable" (AI not configured; plan is the fallback).
+        """
+        if not gemini_client:
+            return "unavailable", WORKOUT_PLAN_FALLBACK
+
+        inputs, fingerprint, stored = await self._current(user)
+
+        if stored and stored[0] == fingerprint:
+            return "ready", json.loads(stored[1])
+
+        # Report a failure once, then let the next request try again
+        failed = self._failed.pop(user.id, None) == fingerprint
+        if not failed:
+            self._schedule(user.id, inputs, fingerprint)
+
+        if stored:
+            return "stale", json.loads(stored[1])
+        if failed:
+            return "error", WORKOUT_PLAN_ERROR_FALLBACK
+        return "generating", None
+
+    async def stream_plan(self, user) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Yield the user's plan as (event, data) pairs for Server-Sent Events.
+
+        Events are "status" (as in get_plan), one "day" per daily plan and
+        finally "plan" with the complete plan. A plan matching the current
+        inputs is replayed from the DB; otherwise a new one is generated
+        and each day is sent as soon as the model has written it.
+        """
+        if not gemini_client:
+            yield "status", {"status": "unavailable"}
+            yield "plan", WORKOUT_PLAN_FALLBACK
+            return
+
+        inputs, fingerprint, stored = await self._current(user)
+
+        if stored and stored[0] == fingerprint:
+            plan = json.loads(stored[1])
+            yield "status", {"status": "ready"}
+            for day in plan["daily_plan"]:
+                yield "day", day
+            yield "plan", plan
+            return
+
+        yield "status", {"status": "generating"}
+        try:
+            async with aclosing(stream_workout_plan(inputs)) as events:
+                async for event, data in events:
+                    if event == "day":
+                        yield event, data
+                    else:
+                        plan = data
+        except Exception as e:
+            if not isinstance(e, CircuitOpenError):
+                print(f"Gemini API or JSON parsing error: {e!r}")
+            yield "status", {"status": "error"}
+            yield "plan", WORKOUT_PLAN_ERROR_FALLBACK
+            return
+
+        await run_db(lambda db: _save_plan(db, user.id, fingerprint, plan))
+        self._failed.pop(user.id, None)
+        yield "plan", plan
+
+    async def _current(self, user) -> Tuple[Dict, str, Optional[Tuple[str, str]]]:
+        inputs, stored = await run_db(
+            lambda db: (workout_plan_inputs(user, db), _load_plan(db, user.id))
+        )
+        return inputs, inputs_fingerprint(inputs), stored
+
+    def _schedule(self, user_id: int, inputs: Dict, fingerprint: str):
+        job = self._jobs.get(user_id)
+        if job and not job.done():
+            return
+
+        job = asyncio.create_task(self._regenerate(user_id, inputs, fingerprint))
+        self._jobs[user_id] = job
+        job.add_done_callback(lambda done: self._job_done(user_id, done))
+
+    def _job_done(self, user_id: int, job: asyncio.Task):
+        if self._jobs.get(user_id) is job:
+            del self._jobs[user_id]
+
+    async def _regenerate(self, user_id: int, inputs: Dict, fingerprint: str):
+        try:
+            plan = await generate_workout_plan(inputs)
+        except Exception as e:
+            if not isinstance(e, CircuitOpenError):
+                print(f"Gemini API or JSON parsing error: {e!r}")
+            self._failed[user_id] = fingerprint
+            return
+
+        await run_db(lambda db: _save_plan(db, user_id, fingerprint, plan))
+
+    async def stop(self):
+        """Cancel plan generations still running."""
+        jobs = list(self._jobs.values())
+        self._jobs.clear()
+        for job in jobs:
+            job.cancel()
+        await asyncio.gather(*jobs, return_exceptions=True)
+
+
+workout_plans = WorkoutPlanService()
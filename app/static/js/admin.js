@@ -11,6 +11,7 @@ function getUser() {
 
 function logout() {
     localStorage.removeItem('access_token');
+    localStorage.removeItem('refresh_token');
     localStorage.removeItem('user');
     window.location.href = '/';
 }
@@ -94,8 +95,17 @@ async function loadUsers() {
 
 async function loadProducts() {
     try {
-        const response = await fetch(`${API_URL}/api/products`);
-        const products = await response.json();
+        // Follow every page so all products can be managed
+        const products = [];
+        let cursor = null;
+        do {
+            const params = new URLSearchParams({ limit: 200 });
+            if (cursor) params.append('cursor', cursor);
+            const response = await fetch(`${API_URL}/api/products?${params.toString()}`);
+            const page = await response.json();
+            products.push(...page.items);
+            cursor = page.next_cursor;
+        } while (cursor);
         
         document.getElementById('productList').innerHTML = `
             <table>
@@ -16,8 +16,9 @@ function getToken() {
     return localStorage.getItem('access_token');
 }
 
-function setToken(token) {
+function setToken(token, refreshToken) {
     localStorage.setItem('access_token', token);
+    localStorage.setItem('refresh_token', refreshToken);
 }
 
 function setUser(user) {
@@ -31,6 +32,7 @@ function getUser() {
 
 function logout() {
     localStorage.removeItem('access_token');
+    localStorage.removeItem('refresh_token');
     localStorage.removeItem('user');
     window.location.href = '/';
 }
@@ -52,7 +54,7 @@ if (loginForm) {
             const data = await response.json();
             
             if (response.ok) {
-                setToken(data.access_token);
+                setToken(data.access_token, data.refresh_token);
                 setUser(data.user);
                 showMessage('Login successful! Redirecting...', 'success');
                 setTimeout(() => {
@@ -94,7 +96,7 @@ if (signupForm) {
             const data = await response.json();
             
             if (response.ok) {
-                setToken(data.access_token);
+                setToken(data.access_token, data.refresh_token);
                 setUser(data.user);
                 showMessage('Account created successfully! Redirecting...', 'success');
                 setTimeout(() => {
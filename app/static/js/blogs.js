@@ -11,6 +11,7 @@ function getUser() {
 
 function logout() {
     localStorage.removeItem('access_token');
+    localStorage.removeItem('refresh_token');
     localStorage.removeItem('user');
     window.location.href = '/';
 }
@@ -45,38 +46,55 @@ function updateNav() {
     }
 }
 
-async function loadBlogs() {
+let blogsCursor = null;
+
+function renderBlog(blog, user) {
+    const canDelete = user && (user.id === blog.author_id || user.role === 'ADMIN');
+    return `
+        <div class="blog-item">
+            <h3>${blog.title}</h3>
+            <div class="blog-meta">
+                Posted on ${new Date(blog.created_at).toLocaleDateString()}
+            </div>
+            <div class="blog-content">${blog.content}</div>
+            ${canDelete ? `<button onclick="deleteBlog(${blog.id})" class="btn-secondary">Delete</button>` : ''}
+        </div>
+    `;
+}
+
+async function loadBlogs(append = false) {
+    const list = document.getElementById('blogList');
+    const loadMoreBtn = document.getElementById('loadMoreBlogs');
+    
     try {
-        const response = await fetch(`${API_URL}/api/blogs`);
-        const blogs = await response.json();
+        const params = new URLSearchParams();
+        if (append && blogsCursor) params.append('cursor', blogsCursor);
         
-        const list = document.getElementById('blogList');
+        const response = await fetch(`${API_URL}/api/blogs?${params.toString()}`);
+        const { items: blogs, next_cursor } = await response.json();
+        blogsCursor = next_cursor;
+        loadMoreBtn.style.display = next_cursor ? 'inline-block' : 'none';
         
-        if (blogs.length === 0) {
+        if (!append && blogs.length === 0) {
             list.innerHTML = '<p>No blogs available yet. Be the first to create one!</p>';
             return;
         }
         
         const user = getUser();
-        list.innerHTML = blogs.map(blog => {
-            const canDelete = user && (user.id === blog.author_id || user.role === 'ADMIN');
-            return `
-                <div class="blog-item">
-                    <h3>${blog.title}</h3>
-                    <div class="blog-meta">
-                        Posted on ${new Date(blog.created_at).toLocaleDateString()}
-                    </div>
-                    <div class="blog-content">${blog.content}</div>
-                    ${canDelete ? `<button onclick="deleteBlog(${blog.id})" class="btn-secondary">Delete</button>` : ''}
-                </div>
-            `;
-        }).join('');
+        const html = blogs.map(blog => renderBlog(blog, user)).join('');
+        if (append) {
+            list.insertAdjacentHTML('beforeend', html);
+        } else {
+            list.innerHTML = html;
+        }
     } catch (error) {
         console.error('Error loading blogs:', error);
         document.getElementById('blogList').innerHTML = '<p>Error loading blogs</p>';
     }
 }
 
+document.getElementById('loadMoreBlogs').addEventListener('click', () => loadBlogs(true));
+
 async function deleteBlog(id) {
     if (!confirm('Are you sure you want to delete this blog?')) return;
     
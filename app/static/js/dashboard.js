@@ -14,6 +14,7 @@ function getUser() {
 
 function logout() {
     localStorage.removeItem('access_token');
+    localStorage.removeItem('refresh_token');
     localStorage.removeItem('user');
     window.location.href = '/';
 }
@@ -145,6 +146,12 @@ function startHeartRateMonitoring() {
     
     heartRateWS.onmessage = (event) => {
         const data = JSON.parse(event.data);
+        
+        if (data.type === 'anomaly') {
+            showAnomalyAlert(data);
+            return;
+        }
+        
         updateHeartRateChart(data.bpm);
         document.getElementById('currentBPM').textContent = `${data.bpm} BPM`;
         
@@ -189,6 +196,35 @@ function updateHeartRateChart(bpm) {
     heartRateChart.update('none');
 }
 
+function renderAnomaly(a) {
+    return `
+        <div class="anomaly-alert severity-${a.severity.toLowerCase()}">
+            <div class="anomaly-header">
+                <span class="anomaly-icon">⚠️</span>
+                <span class="anomaly-severity">${a.severity}</span>
+            </div>
+            <div class="anomaly-details">
+                <strong>${a.bpm} BPM</strong> detected
+                <span class="anomaly-score">Z-score: ${a.z_score}</span>
+            </div>
+        </div>
+    `;
+}
+
+function showAnomalyAlert(anomaly) {
+    const list = document.getElementById('anomalyList');
+    // Replace placeholder/success content with the live alert feed
+    if (!list.querySelector('.anomaly-alert')) {
+        list.innerHTML = '';
+    }
+    list.insertAdjacentHTML('afterbegin', renderAnomaly(anomaly));
+    
+    const alerts = list.querySelectorAll('.anomaly-alert');
+    for (let i = 10; i < alerts.length; i++) {
+        alerts[i].remove();
+    }
+}
+
 async function checkAnomalies() {
     try {
         document.getElementById('anomalyList').innerHTML = '<div class="loading-spinner"></div><p>Analyzing heart rate data...</p>';
@@ -207,18 +243,7 @@ async function checkAnomalies() {
                 </div>
             `;
         } else {
-            document.getElementById('anomalyList').innerHTML = data.anomalies.map(a => `
-                <div class="anomaly-alert severity-${a.severity.toLowerCase()}">
-                    <div class="anomaly-header">
-                        <span class="anomaly-icon">⚠️</span>
-                        <span class="anomaly-severity">${a.severity}</span>
-                    </div>
-                    <div class="anomaly-details">
-                        <strong>${a.bpm} BPM</strong> detected
-                        <span class="anomaly-score">Z-score: ${a.z_score}</span>
-                    </div>
-                </div>
-            `).join('');
+            document.getElementById('anomalyList').innerHTML = data.anomalies.map(renderAnomaly).join('');
         }
     } catch (error) {
         document.getElementById('anomalyList').innerHTML = '<p class="error-text">Error checking anomalies</p>';
@@ -268,10 +293,10 @@ async function loadRecommendedProducts() {
 
 async function loadSleepHistory() {
     try {
-        const response = await fetchWithAuth(`${API_URL}/api/sleep`);
+        const response = await fetchWithAuth(`${API_URL}/api/sleep?limit=5`);
         if (!response) return;
         
-        const records = await response.json();
+        const { items: records } = await response.json();
         const historyHtml = records.slice(0, 5).map(r => `
             <div class="history-item-modern">
                 <div class="history-icon">💤</div>
@@ -291,10 +316,10 @@ async function loadSleepHistory() {
 
 async function loadWorkoutHistory() {
     try {
-        const response = await fetchWithAuth(`${API_URL}/api/workouts`);
+        const response = await fetchWithAuth(`${API_URL}/api/workouts?limit=5`);
         if (!response) return;
         
-        const workouts = await response.json();
+        const { items: workouts } = await response.json();
         const historyHtml = workouts.slice(0, 5).map(w => `
             <div class="history-item-modern">
                 <div class="history-icon">${getWorkoutIcon(w.type)}</div>
@@ -324,10 +349,10 @@ function getWorkoutIcon(type) {
 
 async function loadNutritionHistory() {
     try {
-        const response = await fetchWithAuth(`${API_URL}/api/nutrition`);
+        const response = await fetchWithAuth(`${API_URL}/api/nutrition?limit=5`);
         if (!response) return;
         
-        const nutrition = await response.json();
+        const { items: nutrition } = await response.json();
         const historyHtml = nutrition.slice(0, 5).map(n => `
             <div class="history-item-modern">
                 <div class="history-icon">🍽️</div>
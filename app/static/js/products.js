@@ -11,6 +11,7 @@ function getUser() {
 
 function logout() {
     localStorage.removeItem('access_token');
+    localStorage.removeItem('refresh_token');
     localStorage.removeItem('user');
     window.location.href = '/';
 }
@@ -97,9 +98,28 @@ async function loadCategories() {
 /* -------------------------
    LOAD PRODUCTS
 -------------------------- */
-async function loadProducts() {
+let productsCursor = null;
+
+function renderProduct(p) {
+    return `
+        <a href="/products/${p.id}" class="product-card">
+            <img 
+                src="${p.image_url || '/static/images/placeholder.jpg'}" 
+                alt="${p.name}"
+                onerror="this.src='/static/images/placeholder.jpg'"
+            >
+            <div class="product-info">
+                <h4>${p.name}</h4>
+                <p class="price">Rs. ${Number(p.price).toLocaleString()}</p>
+            </div>
+        </a>
+    `;
+}
+
+async function loadProducts(append = false) {
     const grid = document.getElementById('productGrid');
-    grid.innerHTML = '<p>Loading products...</p>';
+    const loadMoreBtn = document.getElementById('loadMoreProducts');
+    if (!append) grid.innerHTML = '<p>Loading products...</p>';
 
     const search = document.getElementById('searchInput').value.trim();
     const params = new URLSearchParams();
@@ -108,29 +128,25 @@ async function loadProducts() {
     if (selectedCategory !== 'ALL') {
         params.append('category', selectedCategory);
     }
+    if (append && productsCursor) params.append('cursor', productsCursor);
 
     try {
         const res = await fetch(`${API_URL}/api/products?${params.toString()}`);
-        const products = await res.json();
+        const { items: products, next_cursor } = await res.json();
+        productsCursor = next_cursor;
+        loadMoreBtn.style.display = next_cursor ? 'inline-block' : 'none';
 
-        if (!products.length) {
+        if (!append && !products.length) {
             grid.innerHTML = '<p>No products found</p>';
             return;
         }
 
-        grid.innerHTML = products.map(p => `
-            <a href="/products/${p.id}" class="product-card">
-                <img 
-                    src="${p.image_url || '/static/images/placeholder.jpg'}" 
-                    alt="${p.name}"
-                    onerror="this.src='/static/images/placeholder.jpg'"
-                >
-                <div class="product-info">
-                    <h4>${p.name}</h4>
-                    <p class="price">Rs. ${Number(p.price).toLocaleString()}</p>
-                </div>
-            </a>
-        `).join('');
+        const html = products.map(renderProduct).join('');
+        if (append) {
+            grid.insertAdjacentHTML('beforeend', html);
+        } else {
+            grid.innerHTML = html;
+        }
 
     } catch (err) {
         console.error('Failed to load products', err);
@@ -138,10 +154,12 @@ async function loadProducts() {
     }
 }
 
+document.getElementById('loadMoreProducts').onclick = () => loadProducts(true);
+
 /* -------------------------
    SEARCH EVENTS
 -------------------------- */
-document.getElementById('searchBtn').onclick = loadProducts;
+document.getElementById('searchBtn').onclick = () => loadProducts();
 
 document.getElementById('searchInput').addEventListener('keypress', e => {
     if (e.key === 'Enter') loadProducts();
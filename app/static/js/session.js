@@ -0,0 +1,48 @@
+// Access tokens are short-lived. When an authenticated request comes back
+// 401, exchange the refresh token for a new pair once and retry.
+(function () {
+    const originalFetch = window.fetch.bind(window);
+    let refreshing = null;
+
+    async function refreshTokens() {
+        const refreshToken = localStorage.getItem('refresh_token');
+        if (!refreshToken) return null;
+
+        const response = await originalFetch('/auth/refresh', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ refresh_token: refreshToken })
+        });
+
+        if (!response.ok) {
+            localStorage.removeItem('refresh_token');
+            return null;
+        }
+
+        const data = await response.json();
+        localStorage.setItem('access_token', data.access_token);
+        localStorage.setItem('refresh_token', data.refresh_token);
+        localStorage.setItem('user', JSON.stringify(data.user));
+        return data.access_token;
+    }
+
+    window.fetch = async function (url, options = {}) {
+        const response = await originalFetch(url, options);
+        const headers = new Headers(options.headers || {});
+
+        if (response.status !== 401 || !headers.has('Authorization')) {
+            return response;
+        }
+
+        // Share one refresh between requests that fail together; refresh
+        // tokens are single use
+        if (!refreshing) {
+            refreshing = refreshTokens().finally(() => { refreshing = null; });
+        }
+        const token = await refreshing;
+        if (!token) return response;
+
+        headers.set('Authorization', `Bearer ${token}`);
+        return originalFetch(url, { ...options, headers });
+    };
+})();
@@ -11,6 +11,7 @@ function getUser() {
 
 function logout() {
     localStorage.removeItem('access_token');
+    localStorage.removeItem('refresh_token');
     localStorage.removeItem('user');
     window.location.href = '/';
 }
@@ -61,23 +62,70 @@ async function loadUserProfile() {
     }
 }
 
+async function readEvents(response, onEvent) {
+    // Parse a Server-Sent Events body, calling onEvent for each event
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += value;
+        
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            
+            let event = 'message';
+            const data = [];
+            for (const line of block.split('\n')) {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data.push(line.slice(6));
+            }
+            onEvent(event, JSON.parse(data.join('\n')));
+        }
+    }
+}
+
 async function generateWorkoutPlan() {
     const loadingState = document.getElementById('loadingState');
     const generateBtn = document.getElementById('generatePlan');
+    const dailyPlansContainer = document.getElementById('dailyPlansContainer');
     
     try {
         loadingState.style.display = 'block';
         generateBtn.disabled = true;
         
-        const response = await fetchWithAuth(`${API_URL}/api/ai/workout-plan`, {
+        // Days are streamed as soon as they are written, the full plan last
+        const response = await fetchWithAuth(`${API_URL}/api/ai/workout-plan/stream`, {
             method: 'POST'
         });
         
-        if (!response) {
+        if (!response || !response.ok) {
             throw new Error('Failed to generate plan');
         }
         
-        const plan = await response.json();
+        let plan = null;
+        let days = 0;
+        await readEvents(response, (event, data) => {
+            if (event === 'day') {
+                if (days === 0) {
+                    loadingState.style.display = 'none';
+                    document.getElementById('workoutPlanSection').style.display = 'block';
+                    dailyPlansContainer.innerHTML = '';
+                }
+                dailyPlansContainer.insertAdjacentHTML('beforeend', renderDailyPlan(data));
+                days++;
+            } else if (event === 'plan') {
+                plan = data;
+            }
+        });
+        
+        if (!plan) {
+            throw new Error('Plan stream ended early');
+        }
+        
         displayWorkoutPlan(plan);
         saveWorkoutPlan(plan);
         
@@ -90,78 +138,80 @@ async function generateWorkoutPlan() {
     }
 }
 
+function renderDailyPlan(day) {
+    // Check if it's a rest/recovery day
+    const isRestDay = day.exercises.length === 0 || day.focus.toLowerCase().includes('rest');
+    
+    return `
+        <div class="daily-plan-card ${isRestDay ? 'rest-day-card' : ''}">
+            <div class="day-header">
+                <h3>${day.day}</h3>
+                <span class="day-focus">${day.focus}</span>
+            </div>
+            
+            ${day.warm_up && day.warm_up.length > 0 ? `
+            <div class="day-section">
+                <h4>🔥 Warm-up</h4>
+                <ul class="activity-list">
+                    ${day.warm_up.map(item => `<li>${item}</li>`).join('')}
+                </ul>
+            </div>
+            ` : ''}
+            
+            ${day.exercises && day.exercises.length > 0 ? `
+            <div class="day-section">
+                <h4>💪 Main Exercises</h4>
+                <div class="exercises-table">
+                    ${day.exercises.map(ex => `
+                        <div class="exercise-row">
+                            <div class="exercise-main">
+                                <span class="exercise-name">${ex.name}</span>
+                                <span class="muscle-group">${ex.muscle_group}</span>
+                            </div>
+                            <div class="exercise-details">
+                                <span class="exercise-stat">📊 ${ex.sets} sets</span>
+                                <span class="exercise-stat">🔢 ${ex.reps}</span>
+                                <span class="exercise-stat">⏱️ ${ex.rest_seconds}s rest</span>
+                            </div>
+                        </div>
+                    `).join('')}
+                </div>
+            </div>
+            ` : ''}
+            
+            ${day.cardio && day.cardio !== 'No structured cardio planned.' ? `
+            <div class="day-section">
+                <h4>🏃 Cardio</h4>
+                <p class="cardio-text">${day.cardio}</p>
+            </div>
+            ` : ''}
+            
+            ${day.cool_down && day.cool_down.length > 0 ? `
+            <div class="day-section">
+                <h4>🧘 Cool-down & Stretching</h4>
+                <ul class="activity-list">
+                    ${day.cool_down.map(item => `<li>${item}</li>`).join('')}
+                </ul>
+            </div>
+            ` : ''}
+            
+            ${isRestDay && day.cardio === 'No structured cardio planned.' ? `
+            <div class="rest-day-message">
+                <div class="rest-icon">😴</div>
+                <p>Complete rest day - Focus on recovery, sleep, and nutrition</p>
+            </div>
+            ` : ''}
+        </div>
+    `;
+}
+
 function displayWorkoutPlan(plan) {
     document.getElementById('workoutPlanSection').style.display = 'block';
     
     // Daily plans
     const dailyPlansContainer = document.getElementById('dailyPlansContainer');
     if (plan.daily_plan && plan.daily_plan.length > 0) {
-        dailyPlansContainer.innerHTML = plan.daily_plan.map((day, index) => {
-            // Check if it's a rest/recovery day
-            const isRestDay = day.exercises.length === 0 || day.focus.toLowerCase().includes('rest');
-            
-            return `
-            <div class="daily-plan-card ${isRestDay ? 'rest-day-card' : ''}">
-                <div class="day-header">
-                    <h3>${day.day}</h3>
-                    <span class="day-focus">${day.focus}</span>
-                </div>
-                
-                ${day.warm_up && day.warm_up.length > 0 ? `
-                <div class="day-section">
-                    <h4>🔥 Warm-up</h4>
-                    <ul class="activity-list">
-                        ${day.warm_up.map(item => `<li>${item}</li>`).join('')}
-                    </ul>
-                </div>
-                ` : ''}
-                
-                ${day.exercises && day.exercises.length > 0 ? `
-                <div class="day-section">
-                    <h4>💪 Main Exercises</h4>
-                    <div class="exercises-table">
-                        ${day.exercises.map(ex => `
-                            <div class="exercise-row">
-                                <div class="exercise-main">
-                                    <span class="exercise-name">${ex.name}</span>
-                                    <span class="muscle-group">${ex.muscle_group}</span>
-                                </div>
-                                <div class="exercise-details">
-                                    <span class="exercise-stat">📊 ${ex.sets} sets</span>
-                                    <span class="exercise-stat">🔢 ${ex.reps}</span>
-                                    <span class="exercise-stat">⏱️ ${ex.rest_seconds}s rest</span>
-                                </div>
-                            </div>
-                        `).join('')}
-                    </div>
-                </div>
-                ` : ''}
-                
-                ${day.cardio && day.cardio !== 'No structured cardio planned.' ? `
-                <div class="day-section">
-                    <h4>🏃 Cardio</h4>
-                    <p class="cardio-text">${day.cardio}</p>
-                </div>
-                ` : ''}
-                
-                ${day.cool_down && day.cool_down.length > 0 ? `
-                <div class="day-section">
-                    <h4>🧘 Cool-down & Stretching</h4>
-                    <ul class="activity-list">
-                        ${day.cool_down.map(item => `<li>${item}</li>`).join('')}
-                    </ul>
-                </div>
-                ` : ''}
-                
-                ${isRestDay && day.cardio === 'No structured cardio planned.' ? `
-                <div class="rest-day-message">
-                    <div class="rest-icon">😴</div>
-                    <p>Complete rest day - Focus on recovery, sleep, and nutrition</p>
-                </div>
-                ` : ''}
-            </div>
-        `;
-        }).join('');
+        dailyPlansContainer.innerHTML = plan.daily_plan.map(renderDailyPlan).join('');
     } else {
         dailyPlansContainer.innerHTML = '<p class="placeholder-text">No daily plans available</p>';
     }
@@ -1,39 +1,138 @@
-from typing import List, Dict
+from array import array
+from operator import mul
+from typing import Dict, List, Optional
+
+Z_SCORE_THRESHOLD = 2.5
+HIGH_SEVERITY_Z_SCORE = 3
+MIN_SAMPLES = 50
+
+
+def _severity(z_score: float) -> str:
+    return "high" if abs(z_score) > HIGH_SEVERITY_Z_SCORE else "medium"
 
 
 def detect_anomalies(heart_rate_data: List[Dict]) -> List[Dict]:
     """
     Detect anomalies in heart rate data using statistical methods (z-score).
-    
+
+    BPM values are packed into a contiguous int16 array and mean/std come
+    from exact integer sums, so only the flagged readings are touched in
+    Python after the initial copy.
+
     Args:
         heart_rate_data: List of heart rate readings with 'bpm' key
-        
+
     Returns:
         List of anomalous readings with z-score and severity
     """
-    if len(heart_rate_data) < 50:
+    if len(heart_rate_data) < MIN_SAMPLES:
         return []
-    
-    # Extract BPM values
-    bpm_values = [reading["bpm"] for reading in heart_rate_data]
-    
-    # Calculate mean and standard deviation
-    mean_bpm = sum(bpm_values) / len(bpm_values)
-    variance = sum((x - mean_bpm) ** 2 for x in bpm_values) / len(bpm_values)
+
+    bpm_values = array("h", [reading["bpm"] for reading in heart_rate_data])
+    n = len(bpm_values)
+
+    total = sum(bpm_values)
+    total_sq = sum(map(mul, bpm_values, bpm_values))
+    mean_bpm = total / n
+    variance = (total_sq * n - total * total) / (n * n)
     std_bpm = variance ** 0.5
-    
+
+    if std_bpm == 0:
+        return []
+
+    # Flag as anomaly if z-score > 2.5 (roughly 98.8% confidence)
+    low = mean_bpm - Z_SCORE_THRESHOLD * std_bpm
+    high = mean_bpm + Z_SCORE_THRESHOLD * std_bpm
+
     anomalies = []
-    
-    # Detect anomalies using z-score
-    for reading in heart_rate_data:
-        z_score = (reading["bpm"] - mean_bpm) / std_bpm if std_bpm > 0 else 0
-        
-        # Flag as anomaly if z-score > 2.5 (roughly 98.8% confidence)
-        if abs(z_score) > 2.5:
+    for i, bpm in enumerate(bpm_values):
+        if bpm < low or bpm > high:
+            z_score = (bpm - mean_bpm) / std_bpm
             anomalies.append({
-                **reading,
+                **heart_rate_data[i],
                 "z_score": round(z_score, 2),
-                "severity": "high" if abs(z_score) > 3 else "medium"
+                "severity": _severity(z_score)
             })
-    
-    return anomalies
\ No newline at end of file
+
+    return anomalies
+
+
+class RollingAnomalyDetector:
+    """
+    Incremental z-score detector over a sliding window of recent samples.
+
+    Keeps a ring buffer of the last `window` BPM values together with exact
+    running sums, so each new sample is scored in O(1) instead of
+    rescanning history.
+    """
+
+    def __init__(self, window: int = 5000, threshold: float = Z_SCORE_THRESHOLD, min_samples: int = MIN_SAMPLES):
+        """
+        Initialize the detector.
+
+        Args:
+            window: Number of most recent samples the statistics cover
+            threshold: Absolute z-score above which a sample is anomalous
+            min_samples: Samples required before anything is flagged
+        """
+        self.window = window
+        self.threshold = threshold
+        self.min_samples = min_samples
+
+        self._values = array("h", bytes(2 * window))
+        self._head = 0
+        self.count = 0
+        self._sum = 0
+        self._sum_sq = 0
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        if not self.count:
+            return 0.0
+        variance = (self._sum_sq * self.count - self._sum * self._sum) / (self.count * self.count)
+        return max(variance, 0) ** 0.5
+
+    def add(self, bpm: int):
+        """Add a sample to the window without scoring it."""
+        if self.count == self.window:
+            oldest = self._values[self._head]
+            self._sum -= oldest
+            self._sum_sq -= oldest * oldest
+        else:
+            self.count += 1
+
+        self._values[self._head] = bpm
+        self._head = (self._head + 1) % self.window
+        self._sum += bpm
+        self._sum_sq += bpm * bpm
+
+    def update(self, bpm: int, timestamp: Optional[str] = None) -> Optional[Dict]:
+        """
+        Add a sample and score it against the current window.
+
+        Returns:
+            Anomaly dict with z-score and severity, or None if the sample is normal
+        """
+        self.add(bpm)
+
+        if self.count < self.min_samples:
+            return None
+
+        std_bpm = self.std
+        if std_bpm == 0:
+            return None
+
+        z_score = (bpm - self.mean) / std_bpm
+        if abs(z_score) <= self.threshold:
+            return None
+
+        return {
+            "bpm": bpm,
+            "timestamp": timestamp,
+            "z_score": round(z_score, 2),
+            "severity": _severity(z_score)
+        }
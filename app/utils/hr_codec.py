@@ -0,0 +1,81 @@
+import struct
+import sys
+from array import array
+from datetime import datetime
+from itertools import accumulate
+from typing import List, Tuple
+
+# Header: int64 base timestamp (Unix ms) + uint32 sample count, little-endian
+HEADER = struct.Struct("<qI")
+# Bytes per sample after the header: int32 time delta + int16 BPM delta
+RECORD_SIZE = 4 + 2
+
+
+def _little_endian(values: array) -> array:
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def max_payload_size(max_samples: int) -> int:
+    """Size in bytes of a batch holding max_samples samples."""
+    return HEADER.size + max_samples * RECORD_SIZE
+
+
+def encode_samples(timestamps: List[datetime], bpm_values: List[int]) -> bytes:
+    """
+    Encode heart rate samples in the compact binary batch format.
+
+    Layout after the header: int32 millisecond deltas between consecutive
+    timestamps (the first relative to the base), then int16 BPM deltas
+    (the first relative to zero).
+    """
+    millis = [round(ts.timestamp() * 1000) for ts in timestamps]
+    base = millis[0] if millis else 0
+
+    time_deltas = array("i", (b - a for a, b in zip([base] + millis, millis)))
+    bpm_deltas = array("h", (b - a for a, b in zip([0] + list(bpm_values), bpm_values)))
+
+    return (
+        HEADER.pack(base, len(millis))
+        + _little_endian(time_deltas).tobytes()
+        + _little_endian(bpm_deltas).tobytes()
+    )
+
+
+def decode_samples(payload: bytes) -> Tuple[List[datetime], array]:
+    """
+    Decode a binary batch into timestamps and an int16 BPM array.
+
+    Check the payload size against max_payload_size() first; decoding
+    materializes every sample.
+
+    Raises:
+        ValueError: If the payload is truncated or has trailing bytes
+    """
+    if len(payload) < HEADER.size:
+        raise ValueError("Payload too short")
+
+    base, count = HEADER.unpack_from(payload)
+    expected = HEADER.size + count * RECORD_SIZE
+    if len(payload) != expected:
+        raise ValueError(f"Expected {expected} bytes for {count} samples, got {len(payload)}")
+
+    time_deltas = array("i")
+    time_deltas.frombytes(payload[HEADER.size:HEADER.size + count * 4])
+    bpm_deltas = array("h")
+    bpm_deltas.frombytes(payload[HEADER.size + count * 4:])
+
+    try:
+        timestamps = [
+            datetime.fromtimestamp(ms / 1000)
+            for ms in accumulate(_little_endian(time_deltas), initial=base)
+        ][1:]
+    except (OverflowError, OSError):
+        raise ValueError("Timestamp out of range")
+    try:
+        bpm_values = array("h", accumulate(_little_endian(bpm_deltas)))
+    except OverflowError:
+        raise ValueError("BPM value out of range")
+
+    return timestamps, bpm_values
@@ -0,0 +1,25 @@
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def conditional_response(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Tag a response with an ETag and answer If-None-Match requests.
+
+    Clients must revalidate on every use, so they never show a stale
+    catalog, but an unchanged one costs a bodiless 304.
+
+    Returns:
+        A 304 response if the client's copy is current, otherwise None
+        (the ETag headers are set on `response`)
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,32 @@
+from typing import NamedTuple, Optional
+
+from PIL import Image
+
+HASH_BITS = 64
+
+
+class ImageFingerprint(NamedTuple):
+    sha256: str
+    phash: Optional[int]
+
+
+def dhash(img) -> int:
+    """
+    64-bit difference hash (dHash) of a decoded Pillow image.
+
+    Re-encoded, resized or slightly recompressed copies of a photo hash to
+    the same or nearby values.
+    """
+    pixels = list(img.convert("L").resize((9, 8), Image.Resampling.LANCZOS).getdata())
+
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
@@ -0,0 +1,71 @@
+from typing import List, Optional
+
+
+class JsonArrayItems:
+    """
+    Incrementally pull the items of one array out of a streamed JSON object.
+
+    Text is fed in arbitrary chunks as it arrives. Each call returns the raw
+    JSON of every item of the top-level `key` array completed so far, so the
+    items can be parsed and used long before the whole document is in.
+    Only object items are supported, which is what model schemas produce.
+    """
+
+    def __init__(self, key: str):
+        """
+        Initialize the parser.
+
+        Args:
+            key: Top-level key whose array items are returned
+        """
+        self.key = key
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._in_array = False
+
+        # Last string closed at the top level, and the key it became
+        self._string: List[str] = []
+        self._last_string: Optional[str] = None
+        self._current_key: Optional[str] = None
+
+        self._item: List[str] = []
+
+    def feed(self, text: str) -> List[str]:
+        """Consume the next chunk; return the items it completed."""
+        items = []
+        for char in text:
+            capturing = self._in_array and self._depth >= 2 and (self._depth > 2 or char == "{")
+            if capturing:
+                self._item.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = "".join(self._string)
+                elif self._depth == 1:
+                    self._string.append(char)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string = []
+            elif char == ":" and self._depth == 1:
+                self._current_key = self._last_string
+            elif char in "{[":
+                if char == "[" and self._depth == 1 and self._current_key == self.key:
+                    self._in_array = True
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._in_array and self._depth == 2 and char == "}":
+                    items.append("".join(self._item))
+                    self._item = []
+                elif self._in_array and self._depth == 1:
+                    self._in_array = False
+        return items
@@ -0,0 +1,76 @@
+import json
+from contextlib import aclosing
+from datetime import date, datetime
+from typing import AsyncGenerator, AsyncIterator, Dict, Iterable, Iterator, Tuple
+
+from fastapi.responses import StreamingResponse
+
+CHUNK_SIZE = 500
+
+
+def _default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(row: Dict) -> str:
+    return json.dumps(row, default=_default)
+
+
+def ndjson_response(rows: Iterable[Dict]) -> StreamingResponse:
+    """Stream rows as newline-delimited JSON, one object per line."""
+    def lines() -> Iterator[str]:
+        chunk = []
+        for row in rows:
+            chunk.append(_dumps(row))
+            if len(chunk) >= CHUNK_SIZE:
+                yield "\n".join(chunk) + "\n"
+                chunk = []
+        if chunk:
+            yield "\n".join(chunk) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def json_object_response(head: Dict, key: str, rows: Iterable[Dict]) -> StreamingResponse:
+    """
+    Stream a JSON object whose `key` holds a large array.
+
+    The object is written as `head` fields followed by the array, which is
+    sent in chunks as rows are produced instead of being built in memory.
+    """
+    def body() -> Iterator[str]:
+        prefix = _dumps(head)[:-1]
+        yield f'{prefix}, "{key}": [' if head else f'{{"{key}": ['
+
+        chunk = []
+        first = True
+        for row in rows:
+            chunk.append(_dumps(row))
+            if len(chunk) >= CHUNK_SIZE:
+                yield ("" if first else ",") + ",".join(chunk)
+                first = False
+                chunk = []
+        if chunk:
+            yield ("" if first else ",") + ",".join(chunk)
+
+        yield "]}"
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+def sse_response(events: AsyncGenerator[Tuple[str, Dict], None]) -> StreamingResponse:
+    """Stream (event, data) pairs as Server-Sent Events, each sent as it is produced."""
+    async def body() -> AsyncIterator[str]:
+        # A client that disconnects closes the producer, not just this loop
+        async with aclosing(events) as pairs:
+            async for event, data in pairs:
+                yield f"event: {event}\ndata: {_dumps(data)}\n\n"
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
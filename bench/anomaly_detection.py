@@ -0,0 +1,91 @@
+"""
+Benchmark of heart rate anomaly detection.
+
+Compares, at each history size:
+- the original list-of-dicts detect_anomalies (three Python passes),
+- the current array-backed detect_anomalies,
+- RollingAnomalyDetector scoring the same samples one at a time, as the
+  live stream does, in microseconds per sample.
+
+    uv run python bench/anomaly_detection.py --sizes 5000 100000 1000000
+"""
+import argparse
+import random
+import time
+from typing import Dict, List
+
+import common
+from utils.anamoly_detection import RollingAnomalyDetector, detect_anomalies
+
+
+def original_detect_anomalies(heart_rate_data: List[Dict]) -> List[Dict]:
+    """detect_anomalies as it was before the array-backed rewrite."""
+    if len(heart_rate_data) < 50:
+        return []
+
+    bpm_values = [reading["bpm"] for reading in heart_rate_data]
+    mean_bpm = sum(bpm_values) / len(bpm_values)
+    variance = sum((x - mean_bpm) ** 2 for x in bpm_values) / len(bpm_values)
+    std_bpm = variance ** 0.5
+
+    anomalies = []
+    for reading in heart_rate_data:
+        z_score = (reading["bpm"] - mean_bpm) / std_bpm if std_bpm > 0 else 0
+        if abs(z_score) > 2.5:
+            anomalies.append({
+                **reading,
+                "z_score": round(z_score, 2),
+                "severity": "high" if abs(z_score) > 3 else "medium"
+            })
+    return anomalies
+
+
+def history(size: int) -> List[Dict]:
+    """Resting heart rate with occasional spikes, reproducible across runs."""
+    rng = random.Random(size)
+    timestamp = "2026-01-01T00:00:00"
+    return [
+        {"bpm": int(rng.gauss(72, 6)) + (60 if rng.random() < 0.005 else 0), "timestamp": timestamp}
+        for _ in range(size)
+    ]
+
+
+def best_ms(func, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def rolling_us_per_sample(data: List[Dict], window: int) -> float:
+    detector = RollingAnomalyDetector(window=window)
+    started = time.perf_counter()
+    for reading in data:
+        detector.update(reading["bpm"], reading["timestamp"])
+    return (time.perf_counter() - started) / len(data) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 100_000, 1_000_000])
+    parser.add_argument("--window", type=int, default=5000, help="rolling detector window")
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes:
+        data = history(size)
+        assert detect_anomalies(data) == original_detect_anomalies(data)
+        rows.append([
+            size,
+            best_ms(original_detect_anomalies, data),
+            best_ms(detect_anomalies, data),
+            rolling_us_per_sample(data, args.window)
+        ])
+
+    common.print_table(["samples", "original ms", "array ms", "rolling us/sample"], rows)
+
+
+if __name__ == "__main__":
+    main()
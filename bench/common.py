@@ -0,0 +1,96 @@
+"""
+Shared setup for the benchmark scripts.
+
+Run a benchmark from the repository root, e.g.
+
+    uv run python bench/websocket_jitter.py --help
+
+Every run gets its own temporary SQLite database and the fake Gemini
+client, so nothing touches a real database or API.
+"""
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+
+# Settings are read at import time, so the environment has to be in place
+# before anything under app/ is imported
+TMP_DIR = tempfile.mkdtemp(prefix="unified-wellness-bench-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{TMP_DIR}/bench.db",
+    "SECRET_KEY": "bench-secret",
+    "SESSION_SECRET": "bench-session-secret",
+    "ALGORITHM": "HS256",
+    "GEMINI_CLIENT": "fake",
+    "AI_CACHE_PATH": f"{TMP_DIR}/ai-cache.db",
+    "BROADCAST_SOCKET_PATH": f"{TMP_DIR}/broadcast.sock",
+})
+
+sys.path.insert(0, str(APP_DIR))
+# The app serves static/ relative to its own directory
+os.chdir(APP_DIR)
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile of values, p in [0, 1]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def print_table(headers: List[str], rows: List[List]):
+    """Print rows as an aligned plain-text table."""
+    cells = [headers] + [[f"{c:.2f}" if isinstance(c, float) else str(c) for c in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    for i, row in enumerate(cells):
+        print("  ".join(c.rjust(w) for c, w in zip(row, widths)))
+        if i == 0:
+            print("  ".join("-" * w for w in widths))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def serve_app(env: Optional[Dict[str, str]] = None, timeout: float = 60) -> Iterator[str]:
+    """
+    Run the app under uvicorn in a subprocess, yielding its base URL.
+
+    Args:
+        env: Extra environment variables for the server
+        timeout: Seconds to wait for the server to accept connections
+    """
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=APP_DIR,
+        env={**os.environ, **(env or {})}
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError("Server exited during startup")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("Server did not start in time")
+                time.sleep(0.2)
+        yield f"127.0.0.1:{port}"
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
@@ -0,0 +1,88 @@
+"""
+Fan-out benchmark for the heart rate broadcast hub.
+
+Registers N subscribers spread over U users, each drained by its own
+consumer task like a WebSocket handler, then publishes F frames per user
+through the hub and reports delivered messages per second. Producers are
+replaced by idle tasks, so only the fan-out path is measured.
+
+    uv run python bench/hub_fanout.py --subscribers 10000 --users 1 100
+    uv run python bench/hub_fanout.py --backend unix
+"""
+import argparse
+import asyncio
+import time
+
+import common
+from services.broadcast import InProcessBroadcast, UnixSocketBroadcast
+from services.heart_rate_hub import HeartRateHub
+
+
+class IdleHub(HeartRateHub):
+    """Hub whose producers never generate anything."""
+
+    async def _produce(self, user_id: int):
+        await asyncio.Event().wait()
+
+
+async def run(backend_name: str, subscribers: int, users: int, frames: int, queue_size: int):
+    backend = InProcessBroadcast() if backend_name == "memory" else UnixSocketBroadcast(f"{common.TMP_DIR}/hub-{users}.sock")
+    hub = IdleHub(backend=backend, max_queue=queue_size)
+    await hub.start()
+    if backend_name == "unix":
+        while backend._writer is None:
+            await asyncio.sleep(0.01)
+
+    received = 0
+
+    async def consume(subscriber):
+        nonlocal received
+        while True:
+            await subscriber.queue.get()
+            received += 1
+
+    subs = [hub.subscribe(i % users) for i in range(subscribers)]
+    consumers = [asyncio.create_task(consume(s)) for s in subs]
+    await asyncio.sleep(0)
+
+    expected = subscribers * frames
+    started = time.perf_counter()
+    for n in range(frames):
+        for user_id in range(users):
+            await hub.publish(user_id, {"bpm": 72, "timestamp": "2026-01-01T00:00:00", "user_id": user_id, "n": n})
+        await asyncio.sleep(0)
+
+    deadline = time.monotonic() + 60
+    while received + sum(s.dropped for s in subs) < expected and time.monotonic() < deadline:
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - started
+
+    dropped = sum(s.dropped for s in subs)
+    for task in consumers:
+        task.cancel()
+    await asyncio.gather(*consumers, return_exceptions=True)
+    for user_id, subscriber in enumerate(subs):
+        hub.unsubscribe(user_id % users, subscriber)
+    await hub.stop()
+
+    return [backend_name, subscribers, users, frames, received, dropped, received / elapsed]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, default=10_000)
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 100])
+    parser.add_argument("--frames", type=int, default=100, help="frames published per user")
+    parser.add_argument("--queue-size", type=int, default=32)
+    parser.add_argument("--backend", choices=["memory", "unix"], default="memory")
+    args = parser.parse_args()
+
+    rows = [
+        asyncio.run(run(args.backend, args.subscribers, users, args.frames, args.queue_size))
+        for users in args.users
+    ]
+    common.print_table(["backend", "subscribers", "users", "frames", "delivered", "dropped", "msgs/sec"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark of upload preprocessing for the food image endpoint.
+
+Runs prepare_image over a fixture set and reports bytes in and out, time
+per image and how much smaller the payload sent to the model becomes. The
+default fixtures are synthetic phone-sized photos generated with Pillow;
+pass --images to use a directory of real ones instead.
+
+    uv run python bench/image_preprocess.py
+    uv run python bench/image_preprocess.py --images ~/Pictures/food
+"""
+import argparse
+import io
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import common
+from PIL import Image
+
+from core.config import settings
+from utils.image_preprocess import prepare_image
+
+# (name, size, format) of the generated fixtures
+FIXTURES = [
+    ("phone-12mp.jpg", (4032, 3024), "JPEG"),
+    ("phone-portrait.jpg", (3024, 4032), "JPEG"),
+    ("screenshot.png", (1170, 2532), "PNG"),
+    ("small.jpg", (800, 600), "JPEG"),
+]
+
+
+def synthetic_photo(size: Tuple[int, int], fmt: str) -> bytes:
+    """Noise over colour gradients, which compresses about like a photo."""
+    gradient = Image.linear_gradient("L").resize(size)
+    noise = Image.effect_noise(size, 40)
+    img = Image.merge("RGB", (gradient, noise, gradient.rotate(90).resize(size)))
+
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: rotated, so exif_transpose has work to do
+    exif[0x010F] = "BenchCam"
+    out = io.BytesIO()
+    if fmt == "JPEG":
+        img.save(out, format=fmt, quality=92, exif=exif)
+    else:
+        img.save(out, format=fmt)
+    return out.getvalue()
+
+
+def load_fixtures(directory: str = None) -> List[Tuple[str, bytes]]:
+    if directory:
+        paths = sorted(p for p in Path(directory).expanduser().iterdir() if p.is_file())
+        return [(p.name, p.read_bytes()) for p in paths]
+    return [(name, synthetic_photo(size, fmt)) for name, size, fmt in FIXTURES]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", help="directory of images to use instead of the generated set")
+    parser.add_argument("--max-dimension", type=int, default=settings.IMAGE_MAX_DIMENSION)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = []
+    total_in = total_out = 0
+    for name, data in load_fixtures(args.images):
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            prepared = prepare_image(data, args.max_dimension)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        with Image.open(io.BytesIO(prepared.data)) as out:
+            dimensions = f"{out.width}x{out.height}"
+        total_in += len(data)
+        total_out += len(prepared.data)
+        rows.append([
+            name,
+            len(data) // 1024,
+            len(prepared.data) // 1024,
+            dimensions,
+            f"{1 - len(prepared.data) / len(data):.0%}",
+            common.percentile(timings, 0.5)
+        ])
+
+    rows.append(["total", total_in // 1024, total_out // 1024, "", f"{1 - total_out / total_in:.0%}", ""])
+    common.print_table(["image", "KiB in", "KiB out", "out size", "reduction", "p50 ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
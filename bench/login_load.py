@@ -0,0 +1,95 @@
+"""
+Login load benchmark.
+
+Runs C concurrent login loops against a real server while a single client
+polls a cheap authenticated endpoint (/api/bmi/), and reports logins per
+second next to that endpoint's latency. Password hashing that blocked the
+event loop would show up as the probe's p99 climbing with the login load.
+
+    uv run python bench/login_load.py --concurrency 0 4 16 64 --seconds 10
+"""
+import argparse
+import asyncio
+import time
+
+import common
+import httpx
+
+PASSWORD = "bench-password"
+
+
+async def signup(client: httpx.AsyncClient, email: str) -> str:
+    response = await client.post("/auth/signup", json={
+        "email": email,
+        "password": PASSWORD,
+        "name": "Bench User",
+        "height_cm": 175.0,
+        "weight_kg": 70.0
+    })
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def run(host: str, concurrency: int, seconds: float, emails: list, probe_token: str) -> list:
+    logins = 0
+    failures = 0
+    latencies = []
+    deadline = time.monotonic() + seconds
+
+    async with httpx.AsyncClient(base_url=f"http://{host}", timeout=60) as client:
+        async def login_loop(email: str):
+            nonlocal logins, failures
+            while time.monotonic() < deadline:
+                response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+                if response.status_code == 200:
+                    logins += 1
+                else:
+                    failures += 1
+
+        async def probe():
+            headers = {"Authorization": f"Bearer {probe_token}"}
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                response = await client.get("/api/bmi/", headers=headers)
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(0.01)
+
+        started = time.monotonic()
+        await asyncio.gather(probe(), *(login_loop(emails[i % len(emails)]) for i in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    return [
+        concurrency,
+        logins / elapsed,
+        failures,
+        common.percentile(latencies, 0.5),
+        common.percentile(latencies, 0.99)
+    ]
+
+
+async def prepare(host: str, users: int):
+    async with httpx.AsyncClient(base_url=f"http://{host}", timeout=60) as client:
+        emails = [f"login-bench-{i}@example.com" for i in range(users)]
+        for email in emails:
+            await signup(client, email)
+        probe_token = await signup(client, "login-bench-probe@example.com")
+    return emails, probe_token
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[0, 4, 16, 64])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--users", type=int, default=16, help="distinct accounts to log in as")
+    args = parser.parse_args()
+
+    with common.serve_app() as host:
+        emails, probe_token = asyncio.run(prepare(host, args.users))
+        rows = [asyncio.run(run(host, c, args.seconds, emails, probe_token)) for c in args.concurrency]
+
+    common.print_table(["logins in flight", "logins/sec", "failures", "probe p50 ms", "probe p99 ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Product search latency as the catalog grows.
+
+Fills the product table in steps up to each size, then times search_page
+for a rare term, a common term and a prefix, on the first page and on a
+page ten cursors deep. With keyset pagination the deep page should cost
+about the same as the first; cost grows with the number of matches, not
+the size of the catalog.
+
+    uv run python bench/search_latency.py --sizes 1000 10000 100000
+"""
+import argparse
+import random
+import time
+from datetime import datetime
+
+import common
+from core.database import Session, engine, init_db
+from models.product import Product
+from services.search_service import init_search, search_page
+
+WORDS = [
+    "protein", "whey", "shaker", "yoga", "mat", "band", "kettlebell", "dumbbell",
+    "foam", "roller", "bottle", "glove", "strap", "towel", "bar", "oat",
+    "vitamin", "omega", "creatine", "electrolyte", "trail", "running", "shoe", "sock"
+]
+# Words given to roughly one product in a thousand
+RARE_WORDS = ["ultramarathon", "altitude", "recovery"]
+
+QUERIES = {
+    "rare": "ultramarathon",
+    "common": "protein",
+    "prefix": "kettle",
+}
+
+
+def add_products(start: int, stop: int):
+    rng = random.Random(start)
+    rows = []
+    for i in range(start, stop):
+        words = rng.sample(WORDS, 3)
+        if rng.random() < 0.001:
+            words.append(rng.choice(RARE_WORDS))
+        rows.append({
+            "name": " ".join(words[:2]).title(),
+            "description": " ".join(words),
+            "price": 10.0 + i % 90,
+            "category": words[0],
+            "image_url": "/static/img.png",
+            "created_at": datetime(2026, 1, 1)
+        })
+    with engine.begin() as conn:
+        conn.execute(Product.__table__.insert(), rows)
+
+
+def time_search(search: str, depth: int, repeat: int) -> list:
+    """Milliseconds per search_page call for the page `depth` cursors in."""
+    db = Session()
+    try:
+        cursor = None
+        for _ in range(depth):
+            cursor = search_page(db.query(Product), Product, search, cursor)["next_cursor"]
+            if cursor is None:
+                return []
+
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            search_page(db.query(Product), Product, search, cursor)
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+    finally:
+        db.close()
+
+
+def matches(search: str) -> int:
+    db = Session()
+    try:
+        total = 0
+        cursor = None
+        while True:
+            page = search_page(db.query(Product), Product, search, cursor, limit=100)
+            total += len(page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return total
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--depth", type=int, default=10, help="cursors followed for the deep page")
+    args = parser.parse_args()
+
+    init_db()
+    init_search()
+
+    rows = []
+    catalog = 0
+    for size in sorted(args.sizes):
+        add_products(catalog, size)
+        catalog = size
+        for label, search in QUERIES.items():
+            first = time_search(search, 0, args.repeat)
+            deep = time_search(search, args.depth, args.repeat)
+            rows.append([
+                size,
+                label,
+                matches(search),
+                common.percentile(first, 0.5),
+                common.percentile(first, 0.99),
+                common.percentile(deep, 0.5) if deep else "-",
+                common.percentile(deep, 0.99) if deep else "-"
+            ])
+
+    common.print_table(
+        ["products", "query", "matches", "first p50 ms", "first p99 ms", "deep p50 ms", "deep p99 ms"],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Load test for the live heart rate WebSocket stream.
+
+Opens N sockets, one per user, against a real server and measures how far
+each frame's arrival strays from the 1 Hz schedule while every stream is
+also being written to the database. Blocking DB work on the event loop
+shows up directly as send jitter.
+
+    uv run python bench/websocket_jitter.py --sockets 10 100 500 --seconds 15
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import common
+import websockets
+
+# Frames before the producers settle (history warm-up, first flush)
+WARMUP_FRAMES = 2
+
+
+async def watch(url: str, seconds: float, intervals: list):
+    async with websockets.connect(url, open_timeout=30) as ws:
+        last = None
+        frames = 0
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            message = json.loads(await ws.recv())
+            if message.get("type") == "anomaly":
+                continue
+            now = time.monotonic()
+            frames += 1
+            if last is not None and frames > WARMUP_FRAMES:
+                intervals.append(now - last)
+            last = now
+
+
+async def run(host: str, sockets: int, seconds: float, first_user: int) -> list:
+    intervals: list = []
+    await asyncio.gather(*(
+        watch(f"ws://{host}/ws/heart-rate/{first_user + i}", seconds, intervals)
+        for i in range(sockets)
+    ))
+    return intervals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sockets", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--seconds", type=float, default=15)
+    args = parser.parse_args()
+
+    rows = []
+    with common.serve_app() as host:
+        first_user = 1
+        for sockets in args.sockets:
+            intervals = asyncio.run(run(host, sockets, args.seconds, first_user))
+            first_user += sockets
+            jitter_ms = [abs(i - 1.0) * 1000 for i in intervals]
+            rows.append([
+                sockets,
+                len(intervals),
+                common.percentile(jitter_ms, 0.5),
+                common.percentile(jitter_ms, 0.99),
+                max(jitter_ms, default=0.0)
+            ])
+
+    common.print_table(["sockets", "frames", "p50 jitter ms", "p99 jitter ms", "max jitter ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
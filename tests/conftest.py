@@ -0,0 +1,82 @@
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+
+# Settings are read at import time, so the environment has to be in place
+# before anything under app/ is imported
+_tmp = tempfile.mkdtemp(prefix="unified-wellness-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{_tmp}/test.db",
+    "SECRET_KEY": "test-secret",
+    "SESSION_SECRET": "test-session-secret",
+    "ALGORITHM": "HS256",
+    "GEMINI_CLIENT": "fake",
+    "AI_CACHE_PATH": f"{_tmp}/ai-cache.db",
+    "BROADCAST_SOCKET_PATH": f"{_tmp}/broadcast.sock",
+    "PASSWORD_HASH_ROUNDS": "1000",
+})
+
+# The app serves static/ relative to its own directory
+os.chdir(APP_DIR)
+
+
+@pytest.fixture(scope="session")
+def db_schema():
+    """Create every table and index on the test database"""
+    from core.database import init_db
+    init_db()
+
+
+@pytest.fixture
+def db(db_schema):
+    """Database session, closed after the test"""
+    from core.database import Session
+    session = Session()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def client(db_schema):
+    """Test client for the full app, with its lifespan running"""
+    from fastapi.testclient import TestClient
+    from main import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def signup(client, email: str, **profile) -> dict:
+    """Register a user and return their token response"""
+    response = client.post("/auth/signup", json={
+        "name": "Test User",
+        "email": email,
+        "password": "password",
+        **profile
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def auth_header(tokens: dict) -> dict:
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+def update_from_another_worker(user_id: int, **fields):
+    """Change a profile the way another worker would: in the database only"""
+    from core.database import Session
+    from models.user import User
+    db = Session()
+    try:
+        db.query(User).filter(User.id == user_id).update({
+            **fields,
+            User.profile_version: User.profile_version + 1
+        })
+        db.commit()
+    finally:
+        db.close()
@@ -0,0 +1,59 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.ai_gateway import AIGateway, CircuitOpenError
+
+
+async def failing():
+    raise ValueError("upstream error")
+
+
+async def succeeding():
+    return "ok"
+
+
+def test_circuit_opens_after_threshold_and_recovers():
+    async def scenario():
+        gateway = AIGateway(max_concurrency=2, timeout_seconds=1, failure_threshold=2, reset_seconds=0.05)
+        for i in range(2):
+            with pytest.raises(ValueError):
+                await gateway.call(f"fail-{i}", failing)
+        assert gateway.state == "open"
+
+        with pytest.raises(CircuitOpenError):
+            await gateway.call("rejected", succeeding)
+
+        await asyncio.sleep(0.06)
+        assert await gateway.call("trial", succeeding) == "ok"
+        assert gateway.state == "closed"
+        assert gateway.metrics()["rejected"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_identical_calls_in_flight_are_coalesced():
+    async def scenario():
+        gateway = AIGateway()
+        calls = 0
+
+        async def slow():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(gateway.call("same", slow) for _ in range(5)))
+        assert results == [1] * 5
+        assert gateway.metrics()["coalesced"] == 4
+
+    asyncio.run(scenario())
+
+
+def test_breaker_state_is_only_touched_on_the_event_loop():
+    gateway = AIGateway()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        with pytest.raises(RuntimeError):
+            pool.submit(gateway._record_failure).result()
+    assert gateway._consecutive_failures == 0
@@ -0,0 +1,53 @@
+import random
+import statistics
+
+from utils.anamoly_detection import MIN_SAMPLES, RollingAnomalyDetector, detect_anomalies
+
+
+def readings(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    return [{"bpm": int(rng.gauss(72, 6)), "timestamp": f"t{i}"} for i in range(count)]
+
+
+def test_batch_detection_matches_population_z_scores():
+    data = readings(2000) + [{"bpm": 160, "timestamp": "spike"}, {"bpm": 30, "timestamp": "dip"}]
+    values = [r["bpm"] for r in data]
+    mean, std = statistics.fmean(values), statistics.pstdev(values)
+    expected = [r for r in data if abs((r["bpm"] - mean) / std) > 2.5]
+
+    anomalies = detect_anomalies(data)
+
+    assert [a["timestamp"] for a in anomalies] == [r["timestamp"] for r in expected]
+    spike = next(a for a in anomalies if a["timestamp"] == "spike")
+    assert spike["z_score"] == round((160 - mean) / std, 2)
+    assert spike["severity"] == "high"
+
+
+def test_batch_detection_needs_enough_varying_samples():
+    assert detect_anomalies(readings(MIN_SAMPLES - 1)) == []
+    assert detect_anomalies([{"bpm": 70}] * 500) == []
+
+
+def test_rolling_statistics_cover_only_the_window():
+    detector = RollingAnomalyDetector(window=100)
+    values = [r["bpm"] for r in readings(1000)]
+    for bpm in values:
+        detector.add(bpm)
+
+    assert detector.count == 100
+    assert abs(detector.mean - statistics.fmean(values[-100:])) < 1e-9
+    assert abs(detector.std - statistics.pstdev(values[-100:])) < 1e-9
+
+
+def test_rolling_detector_flags_a_spike_once_warmed_up():
+    detector = RollingAnomalyDetector(window=500)
+    early = [detector.update(r["bpm"]) for r in readings(MIN_SAMPLES - 1)]
+    assert early == [None] * (MIN_SAMPLES - 1)
+
+    for r in readings(500, seed=2):
+        detector.update(r["bpm"], r["timestamp"])
+
+    anomaly = detector.update(170, "spike")
+    assert anomaly["timestamp"] == "spike"
+    assert anomaly["severity"] == "high"
+    assert detector.update(72, "normal") is None
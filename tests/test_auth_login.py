@@ -0,0 +1,54 @@
+import asyncio
+import os
+
+from passlib.hash import pbkdf2_sha256
+
+from conftest import signup
+from core.config import settings
+from core.database import Session
+from core.security import hash_password_async, password_pool, verify_password
+from models.user import User
+
+
+def stored_hash(user_id: int) -> str:
+    db = Session()
+    try:
+        return db.query(User.password_hash).filter(User.id == user_id).scalar()
+    finally:
+        db.close()
+
+
+def test_hashing_runs_outside_the_server_process():
+    async def scenario():
+        assert await password_pool.run(os.getpid) != os.getpid()
+        return await hash_password_async("secret")
+
+    password_hash = asyncio.run(scenario())
+    assert verify_password("secret", password_hash)
+    assert not verify_password("wrong", password_hash)
+
+
+def test_login_rejects_a_wrong_password(client):
+    signup(client, "login-wrong@example.com")
+    response = client.post("/auth/login", json={"email": "login-wrong@example.com", "password": "nope"})
+    assert response.status_code == 401
+
+
+def test_login_rehashes_an_outdated_hash(client):
+    user_id = signup(client, "login-rehash@example.com")["user"]["id"]
+
+    db = Session()
+    try:
+        outdated = pbkdf2_sha256.using(rounds=settings.PASSWORD_HASH_ROUNDS + 1).hash("password")
+        db.query(User).filter(User.id == user_id).update({User.password_hash: outdated})
+        db.commit()
+    finally:
+        db.close()
+
+    response = client.post("/auth/login", json={"email": "login-rehash@example.com", "password": "password"})
+    assert response.status_code == 200
+
+    rehashed = stored_hash(user_id)
+    assert rehashed != outdated
+    assert f"${settings.PASSWORD_HASH_ROUNDS}$" in rehashed
+    assert verify_password("password", rehashed)
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from services import broadcast
+from services.broadcast import BroadcastBackend, UnixSocketBroadcast
+
+
+async def wait_for(condition, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out waiting"
+        await asyncio.sleep(0.01)
+
+
+async def started_backend(path: str):
+    """Start a backend that becomes the broker and collects what it receives"""
+    received = asyncio.Queue()
+    backend = UnixSocketBroadcast(path)
+    await backend.start(lambda user_id, message: received.put_nowait((user_id, message)))
+    await wait_for(lambda: backend._writer is not None)
+    return backend, received
+
+
+def test_backend_requires_publish():
+    with pytest.raises(TypeError):
+        BroadcastBackend()
+
+
+def test_malformed_frames_are_skipped(tmp_path):
+    async def scenario():
+        backend, received = await started_backend(str(tmp_path / "broadcast.sock"))
+        try:
+            # A raw peer sends garbage straight to the broker
+            _, writer = await asyncio.open_unix_connection(backend.path)
+            writer.write(b"garbage\nnot-a-number hello\n\xff\xfe 1\n")
+            await writer.drain()
+
+            await backend.publish(7, "hello")
+            assert await asyncio.wait_for(received.get(), 5) == (7, "hello")
+            assert not backend._task.done()
+
+            writer.close()
+        finally:
+            await backend.stop()
+
+    asyncio.run(scenario())
+
+
+def test_peer_that_stops_reading_is_dropped(tmp_path, monkeypatch):
+    monkeypatch.setattr(broadcast, "PEER_DRAIN_TIMEOUT_SECONDS", 0.2)
+
+    async def scenario():
+        backend, received = await started_backend(str(tmp_path / "broadcast.sock"))
+        try:
+            # Connects but never reads, so its socket buffer fills up
+            _, stalled = await asyncio.open_unix_connection(backend.path)
+            await wait_for(lambda: len(backend._peers) == 2)
+
+            frame = "x" * 4096
+            for _ in range(1024):
+                await backend.publish(1, frame)
+            await wait_for(lambda: len(backend._peers) == 1)
+
+            # The remaining worker still gets every frame
+            for _ in range(1024):
+                assert await asyncio.wait_for(received.get(), 5) == (1, frame)
+
+            stalled.close()
+        finally:
+            await backend.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+from conftest import auth_header, signup
+from router import health_router
+from services.heart_rate_ingest import MAX_BATCH_SAMPLES, MAX_JSON_SAMPLE_BYTES
+from utils.hr_codec import encode_samples, max_payload_size
+
+START = datetime(2026, 3, 1, 8, 0, 0)
+
+
+def samples(count: int):
+    timestamps = [START + timedelta(seconds=i) for i in range(count)]
+    return timestamps, [60 + i % 40 for i in range(count)]
+
+
+def test_json_and_binary_batches_are_stored_once(client):
+    headers = auth_header(signup(client, "batch-ok@example.com"))
+    timestamps, bpm_values = samples(100)
+
+    response = client.post("/api/heart-rate/batch", headers=headers, json={
+        "samples": [[ts.isoformat(), bpm] for ts, bpm in zip(timestamps[:50], bpm_values[:50])]
+    })
+    assert response.json() == {"inserted": 50, "duplicates": 0}
+
+    response = client.post(
+        "/api/heart-rate/batch/binary",
+        headers={**headers, "Content-Type": "application/octet-stream"},
+        content=encode_samples(timestamps, bpm_values)
+    )
+    assert response.json() == {"inserted": 50, "duplicates": 50}
+
+
+def test_oversized_binary_batch_is_rejected_before_decoding(client, monkeypatch):
+    headers = auth_header(signup(client, "batch-binary@example.com"))
+
+    def fail(payload):
+        raise AssertionError("oversized payload was decoded")
+    monkeypatch.setattr(health_router, "decode_samples", fail)
+
+    response = client.post(
+        "/api/heart-rate/batch/binary",
+        headers={**headers, "Content-Type": "application/octet-stream"},
+        content=b"\0" * (max_payload_size(MAX_BATCH_SAMPLES) + 1)
+    )
+    assert response.status_code == 413
+
+
+def test_oversized_json_body_is_rejected_before_parsing(client):
+    headers = auth_header(signup(client, "batch-json-body@example.com"))
+
+    # Not even valid JSON: a 413 shows the body was never parsed
+    response = client.post(
+        "/api/heart-rate/batch",
+        headers={**headers, "Content-Type": "application/json"},
+        content=b"[" * (MAX_BATCH_SAMPLES * MAX_JSON_SAMPLE_BYTES + 1)
+    )
+    assert response.status_code == 413
+
+
+def test_json_batch_over_sample_limit_is_rejected(client):
+    headers = auth_header(signup(client, "batch-json-count@example.com"))
+    sample = [START.isoformat(), 60]
+
+    response = client.post("/api/heart-rate/batch", headers=headers, json={
+        "samples": [sample] * (MAX_BATCH_SAMPLES + 1)
+    })
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "too_long"
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+
+from core.database import run_db
+from models.health import HeartRate
+from services.heart_rate_buffer import HeartRateWriteBuffer
+
+USER_ID = 9001
+START = datetime(2026, 2, 1, 12, 0, 0)
+
+
+def test_run_db_keeps_the_event_loop_free(db_schema):
+    async def scenario():
+        loop_thread = threading.current_thread()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        def slow_query(db):
+            time.sleep(0.2)
+            return threading.current_thread()
+
+        task = asyncio.create_task(ticker())
+        worker = await run_db(slow_query)
+        task.cancel()
+
+        assert worker is not loop_thread
+        assert worker.name.startswith("db")
+        # The loop kept running while the query blocked its worker
+        assert ticks >= 10
+
+    asyncio.run(scenario())
+
+
+def test_buffer_writes_every_sample_once(db):
+    async def scenario():
+        buffer = HeartRateWriteBuffer(max_size=100, batch_size=10, flush_interval=0.05)
+        await buffer.start()
+        for i in range(20):
+            await buffer.put(USER_ID, 60 + i, START + timedelta(seconds=i))
+        # A retried sample is skipped, not stored twice
+        await buffer.put(USER_ID, 60, START)
+        await asyncio.sleep(0.2)
+
+        # Whatever is still queued at shutdown is written out
+        for i in range(20, 25):
+            await buffer.put(USER_ID, 60 + i, START + timedelta(seconds=i))
+        await buffer.stop()
+        return buffer.metrics()
+
+    metrics = asyncio.run(scenario())
+
+    assert metrics["rows_flushed"] == 26
+    assert metrics["failed_flushes"] == 0
+    assert metrics["flushes"] >= 3
+    assert db.query(HeartRate).filter(HeartRate.user_id == USER_ID).count() == 25
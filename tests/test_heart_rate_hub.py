@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+from services.broadcast import InProcessBroadcast
+from services.heart_rate_hub import HeartRateHub, Subscriber
+
+
+class IdleHub(HeartRateHub):
+    """Hub whose producers wait instead of generating samples"""
+
+    async def _produce(self, user_id: int):
+        await asyncio.Event().wait()
+
+
+def test_frames_reach_every_subscriber_of_the_user_only():
+    async def scenario():
+        hub = IdleHub(backend=InProcessBroadcast())
+        await hub.start()
+        first, second, other = hub.subscribe(1), hub.subscribe(1), hub.subscribe(2)
+
+        await hub.publish(1, {"bpm": 72})
+
+        assert json.loads(first.queue.get_nowait()) == {"bpm": 72}
+        assert json.loads(second.queue.get_nowait()) == {"bpm": 72}
+        assert other.queue.empty()
+        await hub.stop()
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_keeps_the_newest_frames():
+    async def scenario():
+        subscriber = Subscriber(max_queue=2)
+        for n in range(5):
+            subscriber.offer(str(n))
+
+        assert subscriber.dropped == 3
+        assert [subscriber.queue.get_nowait() for _ in range(2)] == ["3", "4"]
+
+    asyncio.run(scenario())
+
+
+def test_producer_stops_with_the_last_subscriber():
+    async def scenario():
+        hub = IdleHub(backend=InProcessBroadcast(), max_queue=1)
+        await hub.start()
+        first, second = hub.subscribe(1), hub.subscribe(1)
+        producer = hub._producers[1]
+
+        await hub.publish(1, {"n": 1})
+        await hub.publish(1, {"n": 2})
+        assert hub.metrics() == {"streams": 1, "subscribers": 2, "frames_published": 2, "frames_dropped": 2}
+
+        hub.unsubscribe(1, first)
+        await asyncio.sleep(0)
+        assert not producer.cancelled()
+
+        hub.unsubscribe(1, second)
+        await asyncio.sleep(0)
+        assert producer.cancelled()
+        # Frames dropped by closed subscribers are still counted
+        assert hub.metrics() == {"streams": 0, "subscribers": 0, "frames_published": 2, "frames_dropped": 2}
+        await hub.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,70 @@
+import io
+
+import pytest
+from PIL import Image
+
+from core.config import settings
+from core.upload_limit import MULTIPART_OVERHEAD_BYTES
+from services import ai_service
+from utils.image_preprocess import prepare_image
+
+
+def photo(size=(2000, 1500), orientation=None) -> bytes:
+    img = Image.linear_gradient("L").resize(size).convert("RGB")
+    exif = Image.Exif()
+    exif[0x010F] = "TestCam"
+    if orientation:
+        exif[0x0112] = orientation
+    out = io.BytesIO()
+    img.save(out, format="JPEG", exif=exif)
+    return out.getvalue()
+
+
+def upload(client, data: bytes, name: str = "meal.jpg"):
+    return client.post("/api/ai/nutrition-image", files={"file": (name, data, "image/jpeg")})
+
+
+def test_prepared_image_is_a_small_jpeg_without_metadata():
+    prepared = prepare_image(photo(orientation=6), max_dimension=512)
+
+    assert prepared.mime_type == "image/jpeg"
+    with Image.open(io.BytesIO(prepared.data)) as img:
+        assert img.format == "JPEG"
+        # Rotated upright by the orientation tag, then scaled down
+        assert img.size == (384, 512)
+        assert len(img.getexif()) == 0
+
+
+def test_same_photo_gets_the_same_fingerprint():
+    data = photo()
+    assert prepare_image(data, 512).fingerprint == prepare_image(data, 512).fingerprint
+
+
+def test_non_image_is_rejected():
+    with pytest.raises(ValueError):
+        prepare_image(b"not an image", 512)
+
+
+def test_upload_is_analyzed_once_then_served_from_cache(client):
+    data = photo(size=(1200, 900))
+    calls = ai_service.gemini_client.aio.models.calls
+
+    first = upload(client, data)
+    assert first.status_code == 200
+    assert first.json()["food_name"] == "sample"
+
+    second = upload(client, data)
+    assert second.json() == first.json()
+    assert ai_service.gemini_client.aio.models.calls == calls + 1
+
+
+def test_oversized_request_is_rejected_before_it_is_read(client):
+    response = upload(client, b"\0" * (settings.IMAGE_MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES + 1))
+    assert response.status_code == 413
+
+
+def test_file_over_the_image_cap_is_rejected(client, monkeypatch):
+    # Under the request cap set at startup, over the file cap itself
+    monkeypatch.setattr(settings, "IMAGE_MAX_UPLOAD_BYTES", 1024)
+    response = upload(client, photo())
+    assert response.status_code == 413
@@ -0,0 +1,37 @@
+from conftest import auth_header, signup, update_from_another_worker
+from core.dependencies import user_cache
+from core.security import token_cache
+
+
+def test_bmi_follows_update_made_by_another_worker(client):
+    tokens = signup(client, "bmi-worker@example.com", height_cm=180.0, weight_kg=81.0)
+    headers = auth_header(tokens)
+    assert client.get("/api/bmi/", headers=headers).json()["bmi"] == 25.0
+
+    update_from_another_worker(tokens["user"]["id"], weight_kg=64.8)
+
+    # Same access token, nothing invalidated in this process
+    assert client.get("/api/bmi/", headers=headers).json()["bmi"] == 20.0
+
+
+def test_bmi_follows_profile_update_through_a_fresh_cache(client):
+    tokens = signup(client, "bmi-fresh@example.com", height_cm=180.0, weight_kg=81.0)
+    headers = auth_header(tokens)
+
+    response = client.put("/api/user/me", json={"weight_kg": 97.2}, headers=headers)
+    assert response.status_code == 200
+
+    # A worker that never saw the update starts with empty caches
+    user_cache.clear()
+    token_cache.clear()
+    assert client.get("/api/bmi/", headers=headers).json()["bmi"] == 30.0
+
+
+def test_current_token_is_answered_from_claims(client):
+    tokens = signup(client, "bmi-claims@example.com", height_cm=200.0, weight_kg=80.0)
+    headers = auth_header(tokens)
+    user_cache.clear()
+
+    assert client.get("/api/bmi/", headers=headers).json()["bmi"] == 20.0
+    # The user snapshot was never needed
+    assert user_cache.get(tokens["user"]["id"]) is None
@@ -0,0 +1,98 @@
+"""
+Regression tests for the per-user (user_id, date/timestamp) indexes.
+
+Each test runs a real list or history query from the routers, captures the
+SQL it issues and checks SQLite's EXPLAIN QUERY PLAN: the table must be
+searched through the expected index, never scanned, and the ORDER BY must
+come from the index rather than a temporary sort.
+"""
+from contextlib import contextmanager
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+
+from core.database import engine
+from router.health_router import get_heart_rate_anomalies, get_heart_rate_history
+from router.nutrition_router import get_nutrition
+from router.sleep_router import get_sleep
+from router.workout_router import get_workouts
+from services.anomaly_monitor import AnomalyMonitor
+from utils.pagination import encode_cursor
+
+USER = SimpleNamespace(id=1)
+
+
+@contextmanager
+def captured_selects():
+    """Collect (statement, parameters) of every SELECT issued inside the block"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def query_plan(statement, parameters) -> str:
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def assert_uses_index(statements, table: str, index: str):
+    plans = [query_plan(s, p) for s, p in statements if f"FROM {table}" in s]
+    assert plans, f"no query against {table} was issued"
+    for plan in plans:
+        assert f"USING INDEX {index}" in plan or f"USING COVERING INDEX {index}" in plan, plan
+        assert f"SCAN {table}" not in plan, plan
+        assert "TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.parametrize("handler, table, index, sort_value", [
+    (get_workouts, "workout", "ix_workout_user_date", date(2026, 1, 1)),
+    (get_sleep, "sleep", "ix_sleep_user_date", date(2026, 1, 1)),
+    (get_nutrition, "nutrition", "ix_nutrition_user_date", datetime(2026, 1, 1)),
+])
+@pytest.mark.parametrize("first_page", [True, False])
+def test_list_pages_use_user_date_index(db, handler, table, index, sort_value, first_page):
+    cursor = None if first_page else encode_cursor(sort_value, 100)
+    with captured_selects() as statements:
+        handler(cursor=cursor, limit=50, current_user=USER, db=db)
+
+    assert_uses_index(statements, table, index)
+
+
+@pytest.mark.parametrize("start, end", [
+    (None, None),
+    (datetime(2026, 1, 1), None),
+    (datetime(2026, 1, 1), datetime(2026, 1, 2)),
+])
+def test_raw_history_uses_user_timestamp_index(db, start, end):
+    with captured_selects() as statements:
+        get_heart_rate_history(
+            resolution="raw", start=start, end=end, limit=100, format="json",
+            current_user=USER, db=db
+        )
+
+    assert_uses_index(statements, "heartrate", "uq_heartrate_user_timestamp")
+
+
+def test_anomaly_scan_uses_user_timestamp_index(db):
+    with captured_selects() as statements:
+        get_heart_rate_anomalies(current_user=USER, db=db)
+
+    assert_uses_index(statements, "heartrate", "uq_heartrate_user_timestamp")
+
+
+def test_anomaly_warmup_uses_user_timestamp_index(db):
+    with captured_selects() as statements:
+        AnomalyMonitor().ensure_warm(db, USER.id, before_id=100)
+
+    assert_uses_index(statements, "heartrate", "uq_heartrate_user_timestamp")
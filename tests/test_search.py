@@ -0,0 +1,93 @@
+from datetime import datetime
+
+import pytest
+
+from core.database import Session
+from models.product import Product
+from utils.pagination import decode_cursor
+
+
+@pytest.fixture(scope="module")
+def trail_products(client):
+    """Products matching "trailrun" in the name, the description or both"""
+    db = Session()
+    try:
+        products = [
+            Product(
+                name=f"Trailrunner shoe {i}" if i % 3 else f"Hiking sock {i}",
+                description="Grippy trailrunning sole" if i % 2 else "Everyday wear",
+                price=50.0 + i,
+                category="apparel",
+                image_url="/static/img.png",
+                created_at=datetime(2026, 1, 1)
+            )
+            for i in range(12)
+        ]
+        db.add_all(products)
+        db.commit()
+        return {p.id for p in products if "trailrun" in f"{p.name} {p.description}".lower()}
+    finally:
+        db.close()
+
+
+def search(client, **params):
+    response = client.get("/api/products", params={"search": "trailrun", **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_pages_follow_the_ranking_without_repeats(client, trail_products):
+    everything = [p["id"] for p in search(client, limit=50)["items"]]
+
+    paged = []
+    cursor = None
+    while True:
+        page = search(client, limit=2, **({"cursor": cursor} if cursor else {}))
+        paged += [p["id"] for p in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert set(everything) == trail_products
+    assert paged == everything
+    assert len(set(paged)) == len(paged)
+
+
+def test_name_matches_rank_above_description_matches(client, trail_products):
+    names = [p["name"] for p in search(client, limit=50)["items"]]
+    in_name = [n.startswith("Trailrunner") for n in names]
+    assert in_name == sorted(in_name, reverse=True)
+
+
+def test_cursor_seeks_on_score_not_offset(client, trail_products):
+    page = search(client, limit=2)
+    score, row_id = decode_cursor(page["next_cursor"], float)
+    assert row_id == page["items"][-1]["id"]
+    assert score > 0
+
+
+def test_index_follows_updates_and_deletes(client):
+    db = Session()
+    try:
+        product = Product(
+            name="Quokkapack bottle",
+            description="Insulated",
+            price=20.0,
+            category="gear",
+            image_url="/static/img.png",
+            created_at=datetime(2026, 1, 1)
+        )
+        db.add(product)
+        db.commit()
+        assert [p["id"] for p in search(client, search="quokkapack")["items"]] == [product.id]
+
+        product.name = "Wombatpack bottle"
+        db.commit()
+        assert search(client, search="quokkapack")["items"] == []
+        assert [p["id"] for p in search(client, search="wombatpack")["items"]] == [product.id]
+
+        db.delete(product)
+        db.commit()
+        assert search(client, search="wombatpack")["items"] == []
+    finally:
+        db.close()
@@ -0,0 +1,26 @@
+from conftest import auth_header, signup, update_from_another_worker
+from core.dependencies import user_cache
+
+
+def test_unchanged_user_is_served_from_cache(client):
+    tokens = signup(client, "cache-hit@example.com")
+    headers = auth_header(tokens)
+
+    client.get("/api/user/me", headers=headers)
+    hits = user_cache.metrics()["hits"]
+    assert client.get("/api/user/me", headers=headers).json()["name"] == "Test User"
+    assert user_cache.metrics()["hits"] == hits + 1
+
+
+def test_update_made_by_another_worker_is_seen_at_once(client):
+    tokens = signup(client, "cache-stale@example.com")
+    headers = auth_header(tokens)
+    client.get("/api/user/me", headers=headers)
+
+    update_from_another_worker(tokens["user"]["id"], name="Renamed", goals="endurance")
+
+    # This process's snapshot is still cached, but its version is behind
+    assert user_cache.get(tokens["user"]["id"]) is not None
+    me = client.get("/api/user/me", headers=headers).json()
+    assert me["name"] == "Renamed"
+    assert me["goals"] == "endurance"